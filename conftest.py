@@ -27,10 +27,12 @@ from stepler.conftest import pytest_plugins  # noqa
 __all__ = sorted([  # sort for documentation
     'ironic_client',
     'get_ironic_client',
+    'resource_registry',
 
     'get_ironic_port_steps',
     'ironic_port_steps',
     'ironic_port',
+    'port_index',
 
     'get_ironic_node_steps',
     'unexpected_node_cleanup',
@@ -39,7 +41,10 @@ __all__ = sorted([  # sort for documentation
     'primary_nodes',
     'ironic_node',
     'nodes_config',
+    'nodes_plan',
+    'node_pool',
     'prepare_nodes',
+    'booted_nodes',
     'create_nodes',
 
     'ironic_chassis_steps',
@@ -48,6 +53,8 @@ __all__ = sorted([  # sort for documentation
     'primary_chassis',
     'unexpected_chassis_cleanup',
 
+    'ssh_pool',
+
     'api_ironic_client_v1',
     'get_api_ironic_client',
     'ironic_client_v1',
@@ -45,7 +45,26 @@ CURRENT_IRONIC_MICRO_VERSION = '1.30'
 CHANGE_NODE_STATE_TIMEOUT = 600
 AVAILABLE_NODE_STATE_TIMEOUT = 120
 SSH_TIMEOUT = 300
-REBOOT_TIMEOUT = 20
+
+# Max count of concurrent ironic API calls made by steps
+IRONIC_API_WORKERS = int(os.environ.get('IRONIC_API_WORKERS', 10))
+
+# Count of resources got with single request by paginated listings
+IRONIC_PAGE_SIZE = int(os.environ.get('IRONIC_PAGE_SIZE', 100))
+
+# Min count of watched resources which are got with single list request
+# instead of get request per resource
+IRONIC_LIST_THRESHOLD = int(os.environ.get('IRONIC_LIST_THRESHOLD', 3))
+
+# Max ratio of all nodes count to count of watched nodes which are got with
+# single list request; nodes of bigger shared inventory are got one by one
+IRONIC_LIST_RATIO = int(os.environ.get('IRONIC_LIST_RATIO', 10))
+
+# Count of worker processes for SSH checks, threads are used if it's 0
+SSH_PROCESS_WORKERS = int(os.environ.get('SSH_PROCESS_WORKERS', 0))
+
+# Flag whether to run benchmarks of SSH handshakes rate
+SSH_BENCHMARK = bool(os.environ.get('SSH_BENCHMARK', False))
 
 # Image credentials
 IMAGE_USERNAME = 'cirros'
@@ -85,3 +104,7 @@ CLEANUP_UNEXPECTED_AFTER_TEST = bool(
 
 CLEANUP_UNEXPECTED_AFTER_ALL = bool(
     os.environ.get('CLEANUP_UNEXPECTED_AFTER_ALL', False))
+
+CLEANUP_UNEXPECTED = (CLEANUP_UNEXPECTED_BEFORE_TEST or
+                      CLEANUP_UNEXPECTED_AFTER_TEST or
+                      CLEANUP_UNEXPECTED_AFTER_ALL)
@@ -21,14 +21,17 @@ from .chassis import *  # noqa
 from .node import *  # noqa
 from .port import *  # noqa
 from .ironic import *  # noqa
+from .ssh import *  # noqa
 
 __all__ = sorted([  # sort for documentation
     'ironic_client',
     'get_ironic_client',
+    'resource_registry',
 
     'get_ironic_port_steps',
     'ironic_port_steps',
     'ironic_port',
+    'port_index',
 
     'get_ironic_node_steps',
     'unexpected_node_cleanup',
@@ -37,7 +40,10 @@ __all__ = sorted([  # sort for documentation
     'primary_nodes',
     'ironic_node',
     'nodes_config',
+    'nodes_plan',
+    'node_pool',
     'prepare_nodes',
+    'booted_nodes',
     'create_nodes',
 
     'ironic_chassis_steps',
@@ -45,4 +51,6 @@ __all__ = sorted([  # sort for documentation
     'cleanup_chassis',
     'primary_chassis',
     'unexpected_chassis_cleanup',
+
+    'ssh_pool',
 ])
@@ -20,6 +20,7 @@ Ironic chassis fixtures
 import pytest
 
 from spaced_armour_tests.ironic_underlay import config
+from spaced_armour_tests.ironic_underlay import registry
 from spaced_armour_tests.ironic_underlay import steps
 
 __all__ = [
@@ -35,15 +36,18 @@ __all__ = [
 def get_ironic_chassis_steps(get_ironic_client):
     """Callable session fixture to get ironic steps.
 
+    Chassis steps are given node steps to manage chassis nodes with.
+
     Args:
         get_ironic_client (function): function to get ironic client
 
     Returns:
         function: function to instantiated ironic steps
     """
-    def _get_ironic_chassis_steps(**credentials):
+    def _get_ironic_chassis_steps(node_steps=None, **credentials):
         return steps.IronicChassisSteps(
-            get_ironic_client(**credentials).chassis)
+            get_ironic_client(**credentials).chassis,
+            node_steps=node_steps)
 
     return _get_ironic_chassis_steps
 
@@ -51,65 +55,82 @@ def get_ironic_chassis_steps(get_ironic_client):
 @pytest.fixture
 def unexpected_chassis_cleanup(primary_chassis,
                                get_ironic_chassis_steps,
+                               get_ironic_node_steps,
                                cleanup_chassis):
     """Function fixture to clear unexpected volumes.
 
     It provides cleanup before and after test.
     """
     if config.CLEANUP_UNEXPECTED_BEFORE_TEST:
-        cleanup_chassis(get_ironic_chassis_steps())
+        cleanup_chassis(get_ironic_chassis_steps(
+            node_steps=get_ironic_node_steps()))
 
     yield
 
     if config.CLEANUP_UNEXPECTED_AFTER_TEST:
-        cleanup_chassis(get_ironic_chassis_steps())
+        cleanup_chassis(get_ironic_chassis_steps(
+            node_steps=get_ironic_node_steps()))
 
 
 @pytest.fixture
 def ironic_chassis_steps(unexpected_chassis_cleanup,
                          get_ironic_chassis_steps,
-                         cleanup_chassis):
+                         ironic_node_steps,
+                         cleanup_chassis,
+                         resource_registry):
     """Callable function fixture to get ironic steps.
 
     Can be called several times during a test.
-    After the test it destroys all created chassis.
+    After the test it destroys chassis created during the test and
+    recorded in the registry.
 
     Args:
         get_ironic_chassis_steps (function): function to get ironic steps
+        ironic_node_steps (IronicNodeSteps): node steps of the test
         cleanup_chassis (function): function to cleanup chassis after test
+        resource_registry (ResourceRegistry): registry of created resources
 
     Yields:
         IronicChassisSteps: instantiated ironic chassis steps
     """
-    _chassis_steps = get_ironic_chassis_steps()
-
-    chassis_before = _chassis_steps.get_ironic_chassis(check=False)
-    chassis_uuids_before = {chassis.uuid for chassis in chassis_before}
+    _chassis_steps = get_ironic_chassis_steps(node_steps=ironic_node_steps)
+    _chassis_steps.registry = resource_registry
 
     yield _chassis_steps
     cleanup_chassis(_chassis_steps,
-                    uncleanable_chassis_uuids=chassis_uuids_before)
+                    chassis_list=resource_registry.get(registry.CHASSIS))
 
 
 @pytest.fixture(scope='session')
 def cleanup_chassis(uncleanable):
     """Callable session fixture to cleanup chassis.
 
+    If chassis aren't specified, all chassis except uncleanable ones are
+    deleted, that requires listing of all chassis. Nodes are detached from
+    chassis before deleting.
+
     Args:
         uncleanable (AttrDict): Data structure with skipped resources
     """
     def _cleanup_chassis(_chassis_steps,
                          limit=0,
-                         uncleanable_chassis_uuids=None):
-        uncleanable_chassis_uuids = (uncleanable_chassis_uuids or
-                                     uncleanable.chassis_ids)
-        deleting_chassis = []
-
-        for chassis in _chassis_steps.get_ironic_chassis(check=False):
-            if chassis.uuid not in uncleanable_chassis_uuids:
-                deleting_chassis.append(chassis)
+                         uncleanable_chassis_uuids=None,
+                         chassis_list=None):
+        if chassis_list is not None:
+            deleting_chassis = list(chassis_list)
+        else:
+            uncleanable_chassis_uuids = (uncleanable_chassis_uuids or
+                                         uncleanable.chassis_ids)
+            deleting_chassis = []
+
+            for chassis in _chassis_steps.get_ironic_chassis_iterator(
+                    fields=['uuid']):
+                if chassis.uuid not in uncleanable_chassis_uuids:
+                    deleting_chassis.append(chassis)
 
         if len(deleting_chassis) > limit:
+            # chassis with attached nodes can't be deleted
+            _chassis_steps.prepare_chassis_for_deleting(deleting_chassis)
             _chassis_steps.delete_ironic_chassis(deleting_chassis)
 
     return _cleanup_chassis
@@ -117,24 +138,31 @@ def cleanup_chassis(uncleanable):
 
 @pytest.fixture(scope='session')
 def primary_chassis(get_ironic_chassis_steps,
+                    get_ironic_node_steps,
                     cleanup_chassis,
                     uncleanable):
     """Session fixture to remember primary chassis before tests.
 
+    Chassis are listed only if cleanup of unexpected chassis is enabled.
     Also optionally in finalization it deletes all unexpected chassis which
     are remained after tests.
 
     Args:
         get_ironic_chassis_steps (function): Function to get ironic steps.
+        get_ironic_node_steps (function): Function to get ironic node steps.
         cleanup_chassis (function): Function to cleanup volumes.
         uncleanable (AttrDict): Data structure with skipped resources.
     """
     chassis_before = set()
-    for chassis in get_ironic_chassis_steps().get_ironic_chassis(check=False):
-        chassis_before.add(chassis)
-        uncleanable.chassis_ids.add(chassis.uuid)
+    if config.CLEANUP_UNEXPECTED:
+        _chassis_steps = get_ironic_chassis_steps()
+        for chassis in _chassis_steps.get_ironic_chassis_iterator(
+                fields=['uuid']):
+            chassis_before.add(chassis.uuid)
+            uncleanable.chassis_ids.add(chassis.uuid)
 
     yield
     if config.CLEANUP_UNEXPECTED_AFTER_ALL:
-        cleanup_chassis(get_ironic_chassis_steps(),
-                        uncleanable_chassis_uuids=chassis_before)
+        cleanup_chassis(
+            get_ironic_chassis_steps(node_steps=get_ironic_node_steps()),
+            uncleanable_chassis_uuids=chassis_before)
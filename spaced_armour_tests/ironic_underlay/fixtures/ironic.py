@@ -21,10 +21,12 @@ from ironicclient import client
 import pytest
 
 from spaced_armour_tests.ironic_underlay import config
+from spaced_armour_tests.ironic_underlay.registry import ResourceRegistry
 
 __all__ = [
     'get_ironic_client',
-    'ironic_client'
+    'ironic_client',
+    'resource_registry',
 ]
 
 
@@ -58,3 +60,13 @@ def ironic_client(get_ironic_client):
         ironicclient.v1.client.: instantiated ironic client
     """
     return get_ironic_client()
+
+
+@pytest.fixture
+def resource_registry():
+    """Function fixture to get registry of resources created during test.
+
+    Returns:
+        ResourceRegistry: registry of created ironic resources
+    """
+    return ResourceRegistry()
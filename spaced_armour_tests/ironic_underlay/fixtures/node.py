@@ -20,7 +20,9 @@ Ironic node fixtures
 import pytest
 
 from spaced_armour_tests.ironic_underlay import config
+from spaced_armour_tests.ironic_underlay.node_pool import NodePool
 from spaced_armour_tests.ironic_underlay.fixtures.port import ironic_port_steps  # noqa
+from spaced_armour_tests.ironic_underlay import registry
 from spaced_armour_tests.ironic_underlay import steps
 
 
@@ -32,7 +34,10 @@ __all__ = [
     'primary_nodes',
     'ironic_node',
     'nodes_config',
+    'nodes_plan',
+    'node_pool',
     'prepare_nodes',
+    'booted_nodes',
     'create_nodes',
 ]
 
@@ -74,47 +79,63 @@ def unexpected_node_cleanup(primary_nodes,
 @pytest.fixture
 def ironic_node_steps(unexpected_node_cleanup,
                       get_ironic_node_steps,
-                      cleanup_nodes):
+                      cleanup_nodes,
+                      ssh_pool,
+                      resource_registry,
+                      port_index):
     """Callable function fixture to get ironic steps.
 
     Can be called several times during a test.
-    After the test it destroys all created nodes.
+    After the test it destroys nodes created during the test and recorded
+    in the registry; nodes aren't listed, so nodes created by others on
+    shared ironic are kept.
 
     Args:
         get_ironic_node_steps (function): function to get ironic steps
         cleanup_nodes (function): function to cleanup nodes after test
+        ssh_pool (SshConnectionPool): pool of SSH connections to instances
+        resource_registry (ResourceRegistry): registry of created resources
+        port_index (PortIndex): index of ironic ports shared by steps
 
     Yields:
         IronicNodeSteps: instantiated ironic node steps
     """
     _node_steps = get_ironic_node_steps()
-
-    nodes_before = _node_steps.get_ironic_nodes(check=False)
-    nodes_uuids_before = {node.uuid for node in nodes_before}
+    _node_steps.ssh_pool = ssh_pool
+    _node_steps.registry = resource_registry
+    _node_steps.port_index = port_index
 
     yield _node_steps
     cleanup_nodes(_node_steps,
-                  uncleanable_nodes_uuids=nodes_uuids_before)
+                  nodes=resource_registry.get(registry.NODE))
 
 
 @pytest.fixture(scope='session')
 def cleanup_nodes(uncleanable):
     """Callable session fixture to cleanup nodes.
 
+    If nodes aren't specified, all nodes except uncleanable ones are
+    deleted, that requires listing of all nodes.
+
     Args:
         uncleanable (AttrDict): Data structure with skipped resources
     """
 
     def _cleanup_nodes(_nodes_steps,
                        limit=0,
-                       uncleanable_nodes_uuids=None):
-        uncleanable_nodes_uuids = (uncleanable_nodes_uuids or
-                                   uncleanable.nodes_ids)
-        deleting_nodes = []
-
-        for node in _nodes_steps.get_ironic_nodes(check=False):
-            if node.uuid not in uncleanable_nodes_uuids:
-                deleting_nodes.append(node)
+                       uncleanable_nodes_uuids=None,
+                       nodes=None):
+        if nodes is not None:
+            deleting_nodes = list(nodes)
+        else:
+            uncleanable_nodes_uuids = (uncleanable_nodes_uuids or
+                                       uncleanable.nodes_ids)
+            deleting_nodes = []
+
+            for node in _nodes_steps.get_ironic_nodes_iterator(
+                    fields=['uuid']):
+                if node.uuid not in uncleanable_nodes_uuids:
+                    deleting_nodes.append(node)
 
         if len(deleting_nodes) > limit:
             _nodes_steps.delete_ironic_nodes(deleting_nodes)
@@ -128,6 +149,7 @@ def primary_nodes(get_ironic_node_steps,
                   uncleanable):
     """Function fixture to remember primary nodes before tests.
 
+    Nodes are listed only if cleanup of unexpected nodes is enabled.
     Also optionally in finalization it deletes all unexpected nodes which
     are remained after tests.
 
@@ -136,15 +158,16 @@ def primary_nodes(get_ironic_node_steps,
         cleanup_nodes (function): Function to cleanup volumes.
         uncleanable (AttrDict): Data structure with skipped resources.
     """
-    nodes_before = set()
-    for node in get_ironic_node_steps().get_ironic_nodes(check=False):
-        nodes_before.add(node)
-        uncleanable.nodes_ids.add(node.uuid)
+    if config.CLEANUP_UNEXPECTED:
+        for node in get_ironic_node_steps().get_ironic_nodes_iterator(
+                fields=['uuid']):
+            uncleanable.nodes_ids.add(node.uuid)
 
     yield
+    # uncleanable nodes include nodes of session pool besides primary ones
     if config.CLEANUP_UNEXPECTED_AFTER_ALL:
         cleanup_nodes(get_ironic_node_steps(),
-                      uncleanable_nodes_uuids=nodes_before)
+                      uncleanable_nodes_uuids=uncleanable.nodes_ids)
 
 
 @pytest.fixture
@@ -160,9 +183,9 @@ def ironic_node(ironic_node_steps):
     return ironic_node_steps.create_ironic_nodes()[0]
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def nodes_config():
-    """Function fixture to get ironic nodes configuration.
+    """Session fixture to get ironic nodes configuration.
 
     Returns:
         dict: nodes_config dictionary
@@ -188,51 +211,99 @@ def nodes_config():
     return nodes_config
 
 
+@pytest.fixture(scope='session')
+def nodes_plan(nodes_config):
+    """Session fixture to get plan of ironic nodes enrolment.
+
+    Returns:
+        list: plan of nodes for `IronicNodeSteps.enroll_nodes`
+    """
+    nodes_plan = []
+
+    for node_info in nodes_config:
+        nodes_plan.append({
+            'driver': 'pxe_ipmitool_ansible',
+            'driver_info': nodes_config[node_info]['node_driver_info'],
+            'addresses': [nodes_config[node_info]['node_mac']],
+        })
+
+    return nodes_plan
+
+
 @pytest.fixture
-def create_nodes(ironic_node_steps, ironic_port_steps, nodes_config):
-    """Function fixture to create ironic nodes.
+def create_nodes(prepare_nodes):
+    """Function fixture to get ironic nodes of planned hardware.
+
+    Nodes are taken from the session pool, because hardware of nodes plan
+    can't be enrolled twice: ports MAC addresses and BMC are shared.
 
-    #. Create ironic nodes
+    #. Reset nodes of the pool to 'available' provision state
+    #. Restore enrolled definition and ports of reset nodes
 
     Returns:
         list of objects: ironic nodes
     """
-    nodes = []
+    return prepare_nodes
 
-    for node_info in nodes_config:
-        node = ironic_node_steps.create_ironic_nodes(
-            driver='pxe_ipmitool_ansible',
-            driver_info=nodes_config[node_info]['node_driver_info'])[0]
 
-        ironic_port_steps.create_ports(
-            node,
-            addresses=[nodes_config[node_info]['node_mac']])
+@pytest.fixture(scope='session')
+def node_pool(get_ironic_node_steps, nodes_plan, uncleanable):
+    """Session fixture to get pool of ironic nodes shared between tests.
 
-        nodes.append(node)
+    Nodes are enrolled on first use and deleted after all tests.
 
-    return nodes
+    Args:
+        get_ironic_node_steps (function): function to get ironic steps
+        nodes_plan (list): plan of nodes enrolment
+        uncleanable (AttrDict): Data structure with skipped resources
+
+    Yields:
+        NodePool: pool of ironic nodes
+    """
+    pool = NodePool(get_ironic_node_steps(),
+                    nodes_plan,
+                    patch=config.NODE_PATCH)
+
+    yield pool
+
+    nodes_uuids = [node.uuid for node in pool.nodes]
+    pool.close()
+    uncleanable.nodes_ids.difference_update(nodes_uuids)
 
 
 @pytest.fixture
-def prepare_nodes(create_nodes, ironic_node_steps):
+def prepare_nodes(node_pool, uncleanable):
     """Function fixture to prepare ironic nodes.
 
-    #. Update ironic nodes
-    #. Validate ironic nodes
-    #. Check that nodes reach 'available' provision state
+    #. Reset nodes of the pool to 'available' provision state
+    #. Restore enrolled definition and ports of reset nodes
+    #. Enroll, update and provide nodes which weren't reset or restored
 
     Returns:
         list of objects: ironic nodes
     """
-    ironic_node_steps.update_nodes(nodes=create_nodes,
-                                   patch=config.NODE_PATCH)
-    ironic_node_steps.set_nodes_provision_state(
-        nodes=create_nodes,
-        state='manage',
-        timeout=config.AVAILABLE_NODE_STATE_TIMEOUT)
-    ironic_node_steps.set_nodes_provision_state(
-        nodes=create_nodes,
-        state='provide',
-        timeout=config.AVAILABLE_NODE_STATE_TIMEOUT)
-
-    return create_nodes
+    nodes = node_pool.acquire()
+    uncleanable.nodes_ids.update(node.uuid for node in nodes)
+
+    return nodes
+
+
+@pytest.fixture
+def booted_nodes(node_pool, uncleanable):
+    """Function fixture to get ironic nodes with deployed instances.
+
+    Instances deployed for previous tests are reused, tests which break
+    them should mark nodes dirty with `node_pool.mark_dirty`.
+
+    #. Take 'active' nodes of the pool which aren't marked dirty and
+       which instances are reachable via SSH
+    #. Restore enrolled definition and ports of them
+    #. Reset, restore and deploy the rest of nodes
+
+    Returns:
+        list of objects: ironic nodes
+    """
+    nodes = node_pool.acquire_active()
+    uncleanable.nodes_ids.update(node.uuid for node in nodes)
+
+    return nodes
@@ -19,12 +19,15 @@ Ironic port fixtures
 
 import pytest
 
+from spaced_armour_tests.ironic_underlay import registry
 from spaced_armour_tests.ironic_underlay import steps
+from spaced_armour_tests.ironic_underlay.port_index import PortIndex
 
 __all__ = [
     'get_ironic_port_steps',
     'ironic_port_steps',
-    'ironic_port'
+    'ironic_port',
+    'port_index',
 ]
 
 
@@ -47,18 +50,51 @@ def get_ironic_port_steps(get_ironic_client):
 
 
 @pytest.fixture
-def ironic_port_steps(get_ironic_port_steps):
+def port_index(ironic_client):
+    """Function fixture to get index of ironic ports shared by steps.
+
+    Ports are indexed on first use.
+
+    Args:
+        ironic_client (object): instantiated ironic client
+
+    Returns:
+        PortIndex: index of ironic ports by MAC address
+    """
+    return PortIndex(ironic_client)
+
+
+@pytest.fixture
+def ironic_port_steps(get_ironic_port_steps,
+                      resource_registry,
+                      port_index):
     """Callable function fixture to get ironic steps.
 
     Can be called several times during a test.
+    After the test it destroys created ports of nodes which weren't created
+    during the test, other ports are deleted together with their nodes.
+    Ports aren't listed, only ports recorded in the registry are deleted.
 
     Args:
         get_ironic_port_steps (function): function to get ironic steps
+        resource_registry (ResourceRegistry): registry of created resources
+        port_index (PortIndex): index of ironic ports shared by steps
 
-    Returns:
+    Yields:
         IronicPortSteps: instantiated ironic port steps
     """
-    return get_ironic_port_steps()
+    _port_steps = get_ironic_port_steps()
+    _port_steps.registry = resource_registry
+    _port_steps.port_index = port_index
+
+    yield _port_steps
+
+    created_nodes_uuids = {node.uuid for node in
+                           resource_registry.get(registry.NODE)}
+    ports = [port for port in resource_registry.get(registry.PORT)
+             if port.node_uuid not in created_nodes_uuids]
+    if ports:
+        _port_steps.delete_ports(ports)
 
 
 @pytest.fixture
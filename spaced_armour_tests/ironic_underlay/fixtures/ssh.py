@@ -0,0 +1,40 @@
+"""
+------------
+SSH fixtures
+------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from third_party.ssh_pool import SshConnectionPool
+
+__all__ = [
+    'ssh_pool',
+]
+
+
+@pytest.fixture
+def ssh_pool():
+    """Function fixture to get pool of SSH connections.
+
+    All pooled connections are closed after test.
+
+    Yields:
+        SshConnectionPool: pool of SSH connections
+    """
+    pool = SshConnectionPool()
+    yield pool
+    pool.close()
@@ -0,0 +1,223 @@
+"""
+----------------
+Ironic node pool
+----------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+from spaced_armour_tests.ironic_underlay import config
+from third_party import parallel
+
+__all__ = [
+    'NodePool',
+]
+
+LOGGER = logging.getLogger(__name__)
+
+
+class NodePool(object):
+    """Pool of ironic nodes shared between tests.
+
+    Nodes are enrolled once and reset to 'available' provision state
+    each time they are acquired, their enrolled definition and ports are
+    restored then. Only nodes which can't be reset or restored are
+    deleted and enrolled again. Nodes can also be acquired with deployed
+    instances, which are reused until nodes are marked dirty.
+    """
+
+    def __init__(self, node_steps, nodes_plan, patch=None):
+        """Constructor.
+
+        Args:
+            node_steps (IronicNodeSteps): node steps to manage nodes with.
+            nodes_plan (list): plan of nodes like for
+                `IronicNodeSteps.enroll_nodes`.
+            patch (list, optional): patch to apply to nodes each time
+                they are restored, like `config.NODE_PATCH`.
+        """
+        self._node_steps = node_steps
+        self._nodes_plan = list(nodes_plan)
+        self._patch = patch
+        self._nodes = [None] * len(self._nodes_plan)
+        self._dirty = set()
+
+    @property
+    def nodes(self):
+        """list: enrolled nodes of the pool."""
+        return [node for node in self._nodes if node is not None]
+
+    def acquire(self):
+        """Get nodes of the pool in 'available' provision state.
+
+        Returns:
+            list: ironic nodes in order of nodes plan.
+
+        Raises:
+            ParallelExecutionError|AssertionError: if nodes weren't
+                enrolled or restored again.
+        """
+        self._reset(list(range(len(self._nodes))))
+        self._dirty.clear()
+
+        return list(self._nodes)
+
+    def acquire_active(self):
+        """Get nodes of the pool with deployed instances.
+
+        Nodes which are 'active', powered on, not marked dirty and which
+        instances are reachable via SSH are given with restored definition,
+        maintenance is cleared for them. The rest of nodes are reset and
+        deployed again.
+
+        Returns:
+            list: ironic nodes in order of nodes plan.
+
+        Raises:
+            TimeoutExpired: if any node didn't become 'active' in time.
+            ParallelExecutionError: if SSH check failed for any node.
+        """
+        active_nodes = {
+            node.uuid: node for node in self._node_steps.get_ironic_nodes(
+                provision_state='active', check=False)
+            if node.power_state == 'power on'}
+
+        deployed = [node for node in self.nodes
+                    if node.uuid in active_nodes and
+                    node.uuid not in self._dirty]
+        in_maintenance = [node for node in deployed
+                          if active_nodes[node.uuid].maintenance]
+        if in_maintenance:
+            self._node_steps.set_maintenance(in_maintenance, state=False)
+
+        unreachable = self._node_steps.get_ssh_unreachable_nodes(deployed)
+        if unreachable:
+            LOGGER.info("Deploying again %d node(s) of the pool unreachable "
+                        "via SSH", len(unreachable))
+
+        unreachable_uuids = {node.uuid for node in unreachable}
+        deployed_uuids = {node.uuid for node in deployed
+                          if node.uuid not in unreachable_uuids}
+        errors = self._restore(
+            [index for index, node in enumerate(self._nodes)
+             if node is not None and node.uuid in deployed_uuids])
+        deployed_uuids.difference_update(errors)
+        indexes = [index for index, node in enumerate(self._nodes)
+                   if node is None or node.uuid not in deployed_uuids]
+        if indexes:
+            self._reset(indexes)
+            self._node_steps.boot_servers(
+                [self._nodes[index] for index in indexes])
+
+        self._dirty.clear()
+
+        return list(self._nodes)
+
+    def mark_dirty(self, nodes):
+        """Mark nodes which instances are broken by test.
+
+        Dirty nodes are deployed again next time they are acquired with
+        deployed instances.
+
+        Args:
+            nodes (list): ironic nodes of the pool.
+        """
+        self._dirty.update(node.uuid for node in nodes)
+
+    def close(self):
+        """Delete all nodes of the pool."""
+        self._delete([index for index, node in enumerate(self._nodes)
+                      if node is not None])
+
+    def _reset(self, indexes):
+        enrolled = [index for index in indexes
+                    if self._nodes[index] is not None]
+        if enrolled:
+            errors = self._node_steps.reset_nodes(
+                [self._nodes[index] for index in enrolled])
+            errors.update(self._restore(
+                [index for index in enrolled
+                 if self._nodes[index].uuid not in errors]))
+            if errors:
+                self._delete([index for index in enrolled
+                              if self._nodes[index].uuid in errors])
+
+        missing = [index for index in indexes if self._nodes[index] is None]
+        if missing:
+            self._enroll(missing)
+
+    def _get_nodes_plan(self, indexes):
+        nodes_plan = []
+        for index in indexes:
+            node_plan = dict(self._nodes_plan[index])
+            if self._patch:
+                node_plan['patch'] = self._patch
+            nodes_plan.append(node_plan)
+
+        return nodes_plan
+
+    def _restore(self, indexes):
+        """Restore enrolled definition of nodes.
+
+        Returns:
+            dict: errors by uuid of nodes which weren't restored.
+        """
+        if not indexes:
+            return {}
+
+        try:
+            self._node_steps.restore_nodes(
+                [self._nodes[index] for index in indexes],
+                self._get_nodes_plan(indexes))
+        except parallel.ParallelExecutionError as e:
+            LOGGER.warning("Nodes weren't restored: %s", e)
+            return dict(e.errors)
+        except AssertionError as e:
+            LOGGER.warning("Nodes weren't restored: %s", e)
+            return {self._nodes[index].uuid: e for index in indexes}
+
+        return {}
+
+    def _enroll(self, indexes):
+        # patch isn't applied on enrolment, it's sent with restoring PATCH
+        nodes = self._node_steps.enroll_nodes(
+            [self._nodes_plan[index] for index in indexes])
+        self._node_steps.move_nodes_to_state(
+            nodes, state='available',
+            timeout=config.AVAILABLE_NODE_STATE_TIMEOUT)
+
+        for index, node in zip(indexes, nodes):
+            self._nodes[index] = node
+
+        self._node_steps.restore_nodes(nodes, self._get_nodes_plan(indexes))
+
+    def _delete(self, indexes):
+        nodes = [self._nodes[index] for index in indexes]
+        if not nodes:
+            return
+
+        LOGGER.info("Deleting %d node(s) of the pool", len(nodes))
+
+        # nodes in maintenance are deleted without undeploying, so it
+        # doesn't matter which state they are stuck in
+        try:
+            self._node_steps.set_maintenance(nodes, state=True, check=False)
+        except parallel.ParallelExecutionError as e:
+            LOGGER.warning("Maintenance wasn't set for nodes: %s", e)
+        self._node_steps.delete_ironic_nodes(nodes)
+
+        for index in indexes:
+            self._nodes[index] = None
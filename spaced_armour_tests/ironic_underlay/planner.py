@@ -0,0 +1,145 @@
+"""
+-----------------------
+Provision state planner
+-----------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+
+from spaced_armour_tests.ironic_underlay import states
+
+__all__ = [
+    'VERB_SOURCE_STATES',
+    'ABORT_STATES',
+    'TRANSITIONS',
+    'is_plannable',
+    'find_path',
+    'plan_paths',
+]
+
+# Provision states of ironic each provision verb is accepted in. Adoption
+# isn't listed, because it doesn't deploy instance on node.
+VERB_SOURCE_STATES = collections.OrderedDict([
+    ('manage', ('enroll', 'available', 'clean failed', 'inspect failed',
+                'adopt failed')),
+    ('provide', ('manageable',)),
+    ('inspect', ('manageable', 'inspect failed')),
+    ('clean', ('manageable',)),
+    ('active', ('available', 'deploy failed')),
+    ('deleted', ('active', 'deploy failed', 'error', 'wait call-back')),
+    ('rebuild', ('active', 'error')),
+    ('abort', ('clean wait',)),
+])
+
+# Provision state node reaches after abort, it depends on aborted state, so
+# it isn't in `states.PROVISION_VERB_STATES`
+ABORT_STATES = {
+    'clean wait': 'clean failed',
+}
+
+
+def _get_target_state(source, verb):
+    if verb == 'abort':
+        return ABORT_STATES[source]
+    return states.get_expected_provision_state(verb)
+
+
+# (state, verb) -> stable state node reaches, derived from states of verbs
+TRANSITIONS = collections.OrderedDict(
+    ((source, verb), _get_target_state(source, verb))
+    for verb, sources in VERB_SOURCE_STATES.items()
+    for source in sources)
+
+
+def _as_set(targets):
+    if isinstance(targets, (set, frozenset, list, tuple)):
+        return set(targets)
+    return {targets}
+
+
+def is_plannable(state, targets):
+    """Check whether path to desired state can be planned from state.
+
+    Nodes in transient provision states, like 'cleaning' or 'deploying',
+    should be waited to leave them before planning.
+
+    Args:
+        state (str): current provision state of node.
+        targets (str|set): desired provision state or any of states.
+
+    Returns:
+        bool: True if node is in desired state or any verb is accepted in
+            its state.
+    """
+    return state in _as_set(targets) or any(
+        from_state == state for from_state, _ in TRANSITIONS)
+
+
+def find_path(source, targets):
+    """Find the shortest path of provision verbs between states.
+
+    Args:
+        source (str): current provision state of node.
+        targets (str|set): desired provision state or any of states.
+
+    Returns:
+        list: (verb, provision state) pairs to apply one by one; empty if
+            node is already in desired state.
+
+    Raises:
+        ValueError: if desired state can't be reached from source one.
+    """
+    targets = _as_set(targets)
+
+    paths = {source: []}
+    queue = collections.deque([source])
+
+    while queue:
+        state = queue.popleft()
+        if state in targets:
+            return paths[state]
+
+        for (from_state, verb), to_state in TRANSITIONS.items():
+            if from_state == state and to_state not in paths:
+                paths[to_state] = paths[state] + [(verb, to_state)]
+                queue.append(to_state)
+
+    raise ValueError("Provision state {!r} can't be reached from {!r}".format(
+        sorted(targets), source))
+
+
+def plan_paths(provision_states, targets):
+    """Group nodes by paths to desired provision state.
+
+    Args:
+        provision_states (dict): current provision states by node uuid.
+        targets (str|set): desired provision state or any of states.
+
+    Returns:
+        OrderedDict: nodes uuids by path like from `find_path`; nodes
+            which are already in desired state aren't included.
+
+    Raises:
+        ValueError: if desired state can't be reached for any node.
+    """
+    plan = collections.OrderedDict()
+
+    for node_uuid, state in provision_states.items():
+        path = tuple(find_path(state, targets))
+        if path:
+            plan.setdefault(path, []).append(node_uuid)
+
+    return plan
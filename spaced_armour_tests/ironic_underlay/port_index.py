@@ -0,0 +1,186 @@
+"""
+-----------------
+Ironic port index
+-----------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import threading
+
+from ironicclient import exceptions
+
+__all__ = [
+    'PortIndex',
+]
+
+
+class PortIndex(object):
+    """Index of ironic ports by MAC address.
+
+    Ports are resolved to their nodes and instances IP addresses of nodes
+    without requests. Ports are listed incrementally starting after the
+    last indexed one, deleted ports should be discarded explicitly by steps
+    which delete them. Instances IP addresses are got only for nodes of
+    indexed ports which are asked for, nodes which aren't found are
+    discarded with their ports. MAC addresses are indexed in lower case,
+    like ironic keeps them. The index is thread safe.
+    """
+
+    def __init__(self, client):
+        """Constructor.
+
+        Args:
+            client (object): ironic client.
+        """
+        self._client = client
+        self._ports = collections.OrderedDict()
+        self._addresses = {}
+        self._ip_addresses = {}
+        self._marker = None
+        self._lock = threading.Lock()
+        self.refreshed = False
+
+    def refresh(self, full=False):
+        """Index ports created since last refresh.
+
+        New ports are got with single detailed listing, nodes aren't
+        listed.
+
+        Args:
+            full (bool): flag whether to index all ports from scratch.
+        """
+        with self._lock:
+            if full:
+                self._reset()
+
+            try:
+                ports = self._client.port.list(detail=True, limit=0,
+                                               marker=self._marker)
+            except exceptions.NotFound:
+                # port used as marker is deleted
+                self._reset()
+                ports = self._client.port.list(detail=True, limit=0)
+
+            for port in ports:
+                self._ports[port.uuid] = port
+                self._addresses[port.address.lower()] = port.uuid
+                self._marker = port.uuid
+
+            self.refreshed = True
+
+    def refresh_nodes(self, uuids):
+        """Get instances IP addresses of nodes again.
+
+        Nodes are got with get request per node; nodes which aren't found
+        are discarded with their ports.
+
+        Args:
+            uuids (iterable): uuids of nodes of indexed ports.
+        """
+        for uuid in set(uuids):
+            self._fetch_instance_ip(uuid)
+
+    def discard(self, uuids):
+        """Remove deleted ports from the index.
+
+        Args:
+            uuids (iterable): uuids of deleted ports.
+        """
+        with self._lock:
+            self._remove(uuids)
+
+    def discard_nodes(self, uuids):
+        """Remove ports of deleted nodes from the index.
+
+        Args:
+            uuids (iterable): uuids of deleted nodes.
+        """
+        uuids = set(uuids)
+        with self._lock:
+            self._remove([port.uuid for port in self._ports.values()
+                          if port.node_uuid in uuids])
+            for uuid in uuids:
+                self._ip_addresses.pop(uuid, None)
+
+    def get_port(self, address):
+        """Get indexed port by MAC address.
+
+        Args:
+            address (str): MAC address of port.
+
+        Returns:
+            object: ironic port or None if it isn't indexed.
+        """
+        with self._lock:
+            return self._ports.get(self._addresses.get(address.lower()))
+
+    def get_node_uuid(self, address):
+        """Get uuid of node which port with MAC address belongs to.
+
+        Args:
+            address (str): MAC address of port.
+
+        Returns:
+            str: node uuid or None if port isn't indexed.
+        """
+        port = self.get_port(address)
+        return port.node_uuid if port is not None else None
+
+    def get_instance_ip(self, address):
+        """Get instance IP address of node by MAC address of its port.
+
+        IP address is got with get request of node on first use.
+
+        Args:
+            address (str): MAC address of port.
+
+        Returns:
+            str: instance ipv4 address or None if it isn't known.
+        """
+        node_uuid = self.get_node_uuid(address)
+        if node_uuid is None:
+            return None
+
+        with self._lock:
+            if node_uuid in self._ip_addresses:
+                return self._ip_addresses[node_uuid]
+
+        return self._fetch_instance_ip(node_uuid)
+
+    def _fetch_instance_ip(self, node_uuid):
+        try:
+            node = self._client.node.get(node_uuid,
+                                         fields=['uuid', 'instance_info'])
+        except exceptions.NotFound:
+            self.discard_nodes([node_uuid])
+            return None
+
+        ip_address = (node.instance_info or {}).get('ipv4_address')
+        with self._lock:
+            self._ip_addresses[node_uuid] = ip_address
+
+        return ip_address
+
+    def _remove(self, uuids):
+        for uuid in uuids:
+            port = self._ports.pop(uuid, None)
+            if port is not None:
+                self._addresses.pop(port.address.lower(), None)
+
+    def _reset(self):
+        self._ports.clear()
+        self._addresses.clear()
+        self._marker = None
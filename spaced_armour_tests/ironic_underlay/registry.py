@@ -0,0 +1,79 @@
+"""
+--------------------------
+Created resources registry
+--------------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import threading
+
+__all__ = [
+    'NODE',
+    'PORT',
+    'CHASSIS',
+    'ResourceRegistry',
+]
+
+NODE = 'node'
+PORT = 'port'
+CHASSIS = 'chassis'
+
+
+class ResourceRegistry(object):
+    """Registry of ironic resources created through steps.
+
+    Resources are kept by kind and uuid in order of creation, so they can
+    be cleaned up without listing of the whole inventory. The registry is
+    thread safe.
+    """
+
+    def __init__(self):
+        self._resources = collections.defaultdict(collections.OrderedDict)
+        self._lock = threading.Lock()
+
+    def add(self, kind, resources):
+        """Register created resources.
+
+        Args:
+            kind (str): kind of resources, like `NODE`
+            resources (list): created resources
+        """
+        with self._lock:
+            for resource in resources:
+                self._resources[kind][resource.uuid] = resource
+
+    def discard(self, kind, uuids):
+        """Unregister deleted resources.
+
+        Args:
+            kind (str): kind of resources, like `NODE`
+            uuids (iterable): uuids of deleted resources
+        """
+        with self._lock:
+            for uuid in uuids:
+                self._resources[kind].pop(uuid, None)
+
+    def get(self, kind):
+        """Get registered resources.
+
+        Args:
+            kind (str): kind of resources, like `NODE`
+
+        Returns:
+            list: registered resources in order of creation
+        """
+        with self._lock:
+            return list(self._resources[kind].values())
@@ -0,0 +1,128 @@
+"""
+------------------
+Ironic node states
+------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__all__ = [
+    'PROVISION_VERB_STATES',
+    'PROVISION_FAILURE_STATES',
+    'POWER_VERB_STATES',
+    'DELETE_ALLOWED_PROVISION_STATES',
+    'NodesProvisionFailed',
+    'get_expected_provision_state',
+    'get_expected_power_state',
+    'get_provision_failures',
+]
+
+# Stable provision state node reaches after provision verb is applied;
+# states which aren't listed here are expected as is.
+PROVISION_VERB_STATES = {
+    'deleted': 'available',
+    'provide': 'available',
+    'manage': 'manageable',
+    'inspect': 'manageable',
+    'clean': 'manageable',
+    'rebuild': 'active',
+}
+
+# Provision states node can't leave without operator's action while it
+# goes to expected provision state.
+PROVISION_FAILURE_STATES = {
+    'active': {'deploy failed', 'error'},
+    'available': {'clean failed', 'error'},
+    'manageable': {'clean failed', 'inspect failed', 'error'},
+    'clean wait': {'clean failed'},
+}
+
+# Power state node reaches after power verb is applied.
+POWER_VERB_STATES = {
+    'on': 'power on',
+    'off': 'power off',
+    'soft off': 'power off',
+    'reboot': 'power on',
+    'soft reboot': 'power on',
+}
+
+# Provision states node can be deleted in without maintenance.
+DELETE_ALLOWED_PROVISION_STATES = {
+    'available',
+    'manageable',
+    'enroll',
+    'adopt failed',
+}
+
+
+class NodesProvisionFailed(AssertionError):
+    """Error raised if nodes failed to reach expected provision state.
+
+    Attributes:
+        expected_state (str): expected provision state.
+        failures (dict): (provision_state, last_error) by node uuid.
+    """
+
+    def __init__(self, expected_state, failures):
+        self.expected_state = expected_state
+        self.failures = failures
+
+        report = ["Nodes failed to reach '{0}' provision state:".format(
+            expected_state)]
+        for node_uuid, (state, last_error) in sorted(failures.items()):
+            report.append("  {0} is '{1}': {2}".format(
+                node_uuid, state, last_error))
+
+        super(NodesProvisionFailed, self).__init__('\n'.join(report))
+
+
+def get_expected_provision_state(state):
+    """Get provision state node should reach for requested state.
+
+    Args:
+        state (str): provision verb or provision state.
+
+    Returns:
+        str: expected provision state.
+    """
+    return PROVISION_VERB_STATES.get(state, state)
+
+
+def get_expected_power_state(state):
+    """Get power state node should reach for requested power verb.
+
+    Args:
+        state (str): power verb or power state.
+
+    Returns:
+        str: expected power state.
+    """
+    return POWER_VERB_STATES.get(state, state)
+
+
+def get_provision_failures(nodes, expected_state):
+    """Get nodes which are stuck in failure state for expected state.
+
+    Args:
+        nodes (iterable): ironic nodes with `provision_state` and
+            `last_error` attributes.
+        expected_state (str): expected provision state.
+
+    Returns:
+        dict: (provision_state, last_error) of failed nodes by node uuid.
+    """
+    failure_states = PROVISION_FAILURE_STATES.get(expected_state, set())
+
+    return {node.uuid: (node.provision_state, node.last_error)
+            for node in nodes if node.provision_state in failure_states}
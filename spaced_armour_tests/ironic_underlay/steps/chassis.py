@@ -17,25 +17,111 @@ Ironic chassis steps
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import logging
+import time
+
 from hamcrest import assert_that, equal_to, is_not, empty  # noqa
 from ironicclient import exceptions
 
 from stepler.base import BaseSteps
 
-from spaced_armour_tests.ironic_underlay.steps.node import IronicNodeSteps
+from spaced_armour_tests.ironic_underlay import config
+from spaced_armour_tests.ironic_underlay import registry
 
 from stepler.third_party import steps_checker
 from stepler.third_party import utils
-from stepler.third_party import waiter
+
+from third_party import deadline
+from third_party import parallel
+from third_party import patch as json_patch
+from third_party.utils import iterate_pages
 
 __all__ = [
     'IronicChassisSteps'
 ]
 
+LOGGER = logging.getLogger(__name__)
+
 
 class IronicChassisSteps(BaseSteps):
     """Chassis steps."""
 
+    workers = config.IRONIC_API_WORKERS
+    registry = None
+
+    def __init__(self, client, node_steps=None):
+        """Constructor.
+
+        Args:
+            client (object): ironic chassis client.
+            node_steps (IronicNodeSteps, optional): node steps to manage
+                chassis nodes with; they are required by steps which
+                change chassis nodes.
+        """
+        super(IronicChassisSteps, self).__init__(client)
+        self.node_steps = node_steps
+
+    def _map_bulk(self, func, items, workers=None, key=None):
+        """Call function for each item concurrently, collecting failures.
+
+        Args:
+            func (function): function to call with single item
+            items (list): items to process
+            workers (int, optional): max count of concurrent calls,
+                `workers` of steps by default
+            key (function, optional): function to get item key
+
+        Returns:
+            tuple: OrderedDicts of results and errors by item key
+        """
+        try:
+            results = parallel.parallel_map(func, items,
+                                            workers=workers or self.workers,
+                                            key=key)
+            return results, collections.OrderedDict()
+        except parallel.ParallelExecutionError as e:
+            return e.results, e.errors
+
+    def _apply_in_waves(self, chassis, func, action, wave_size=0):
+        """Apply action to nodes of chassis wave by wave.
+
+        Args:
+            chassis (object): ironic chassis
+            func (function): function taking list of nodes of a wave and
+                returning seconds each node took to finish the action
+            action (str): action description for progress report
+            wave_size (int): count of nodes in a wave, all nodes are
+                processed at once if it's 0
+
+        Returns:
+            OrderedDict: seconds each node took to finish the action by node
+                uuid in order of waves
+        """
+        nodes = self.node_steps.get_chassis_nodes_index([chassis])[
+            chassis.uuid]
+        wave_size = wave_size or len(nodes) or 1
+        latencies = collections.OrderedDict()
+
+        for first in range(0, len(nodes), wave_size):
+            wave = nodes[first:first + wave_size]
+            start = time.time()
+            wave_latencies = func(wave) or {}
+
+            for node in wave:
+                latencies[node.uuid] = wave_latencies.get(node.uuid)
+
+            LOGGER.info(
+                "Chassis %s: %s finished for %d of %d node(s), wave of %d "
+                "node(s) took %.1f second(s): %s",
+                chassis.uuid, action, len(latencies), len(nodes), len(wave),
+                time.time() - start,
+                ', '.join('{0} {1:.1f}s'.format(node_uuid, latency)
+                          for node_uuid, latency in sorted(
+                              wave_latencies.items())))
+
+        return latencies
+
     @steps_checker.step
     def create_ironic_chassis(self, descriptions=None, count=1, check=True):
         """Step to create a ironic chassis.
@@ -65,6 +151,9 @@ class IronicChassisSteps(BaseSteps):
             _chassis_descriptions[chassis.uuid] = description
             chassis_list.append(chassis)
 
+        if self.registry is not None:
+            self.registry.add(registry.CHASSIS, chassis_list)
+
         if check:
             self.check_ironic_chassis_presence(chassis_list)
             for chassis in chassis_list:
@@ -73,23 +162,114 @@ class IronicChassisSteps(BaseSteps):
 
         return chassis_list
 
+    @steps_checker.step
+    def create_ironic_chassis_bulk(self,
+                                   descriptions=None,
+                                   count=1,
+                                   workers=None,
+                                   check=True):
+        """Step to create many ironic chassis concurrently.
+
+        Failure of some chassis doesn't stop creating the rest of them.
+
+        Args:
+            descriptions (list): unique descriptions of created chassis, if
+                not specified they are generated
+            count (int): count of created chassis, it's ignored if
+                descriptions are specified
+            workers (int, optional): max count of concurrent requests,
+                `config.IRONIC_API_WORKERS` by default
+            check (bool): flag whether to check created chassis presence
+
+        Returns:
+            tuple: OrderedDicts of created chassis and errors by description
+
+        Raises:
+            TimeoutExpired: if check failed after timeout
+        """
+        descriptions = list(descriptions or utils.generate_ids(count=count))
+
+        created, errors = self._map_bulk(
+            lambda description: self._client.create(description=description),
+            descriptions,
+            workers=workers)
+
+        if self.registry is not None:
+            self.registry.add(registry.CHASSIS, created.values())
+
+        if check:
+            self.check_ironic_chassis_presence(list(created.values()))
+
+        return created, errors
+
+    @steps_checker.step
+    def delete_ironic_chassis_bulk(self, chassis_list, workers=None,
+                                   check=True):
+        """Step to delete many ironic chassis concurrently.
+
+        Failure of some chassis doesn't stop deleting the rest of them.
+
+        Args:
+            chassis_list (list): list of ironic chassis
+            workers (int, optional): max count of concurrent requests,
+                `config.IRONIC_API_WORKERS` by default
+            check (bool): flag whether to check deleted chassis absence
+
+        Returns:
+            tuple: lists of deleted chassis uuids and OrderedDict of errors
+                by chassis uuid
+
+        Raises:
+            TimeoutExpired: if check failed after timeout
+        """
+        deleted, errors = self._map_bulk(
+            lambda chassis: self._client.delete(chassis.uuid),
+            chassis_list,
+            workers=workers,
+            key=lambda chassis: chassis.uuid)
+        deleted = list(deleted)
+
+        if self.registry is not None:
+            self.registry.discard(registry.CHASSIS, deleted)
+
+        if check:
+            self.check_ironic_chassis_presence(
+                [chassis for chassis in chassis_list
+                 if chassis.uuid in deleted],
+                must_present=False)
+
+        return deleted, errors
+
     @steps_checker.step
     def prepare_chassis_for_deleting(self, chassis_list, check=True):
-        """Step to delete chassis.
+        """Step to detach all nodes from chassis before deleting.
+
+        Attached nodes are got from chassis nodes index and detached with
+        one concurrent PATCH request per node.
 
         Args:
             chassis_list (list): list of ironic chassis
             check (bool): flag whether to check step or not
+
+        Raises:
+            AssertionError: if any node is still attached to chassis
         """
-        nodes = IronicNodeSteps.get_ironic_nodes()
+        index = self.node_steps.get_chassis_nodes_index(chassis_list)
 
+        nodes_patch = json_patch.PatchAccumulator()
         for chassis in chassis_list:
-            for node in nodes:
-                node = self._get_node(node.uuid)
-                if node.chassis_uuid == chassis.uuid:
-                    IronicNodeSteps.detach_nodes_from_chassis([node],
-                                                              [chassis])
-                assert_that(node.chassis_uuid, equal_to(chassis[0].uuid))
+            self.node_steps.detach_nodes_from_chassis(index[chassis.uuid],
+                                                      [chassis],
+                                                      nodes_patch=nodes_patch)
+
+        if len(nodes_patch):
+            self.node_steps.apply_nodes_patch(nodes_patch, check=False)
+
+        if check:
+            nodes = [node for chassis_nodes in index.values()
+                     for node in chassis_nodes]
+            self.node_steps.check_nodes_not_attached_to_chassis(nodes,
+                                                                chassis_list)
 
     @steps_checker.step
     def delete_ironic_chassis(self, chassis_list, check=True):
@@ -102,6 +282,10 @@ class IronicChassisSteps(BaseSteps):
         for chassis in chassis_list:
             self._client.delete(chassis.uuid)
 
+        if self.registry is not None:
+            self.registry.discard(registry.CHASSIS,
+                                  [chassis.uuid for chassis in chassis_list])
+
         if check:
             self.check_ironic_chassis_presence(chassis_list,
                                                must_present=False)
@@ -113,11 +297,16 @@ class IronicChassisSteps(BaseSteps):
                                       chassis_timeout=0):
         """Verify step to check ironic chassis is present.
 
+        Chassis are listed with single request, but they are got with get
+        request per chassis if their count is less than
+        `config.IRONIC_LIST_THRESHOLD`.
+
         Args:
             chassis_list (list): list of ironic chassis to check presence
                 status
             must_present (bool): flag whether chassis should present or not
-            chassis_timeout (int): seconds to wait a result of check
+            chassis_timeout (int): seconds to wait a result of check for
+                each chassis
 
         Raises:
             TimeoutExpired: if check failed after timeout
@@ -125,21 +314,105 @@ class IronicChassisSteps(BaseSteps):
         expected_presence = {chassis.uuid: must_present
                              for chassis in chassis_list}
 
-        def _check_chassis_presence():
-            actual_presence = {}
+        def _get_chassis_presence(chassis_uuids):
+            if len(chassis_uuids) < config.IRONIC_LIST_THRESHOLD:
+                actual_presence = {}
 
-            for chassis in chassis_list:
-                try:
-                    self._client.get(chassis.uuid)
-                    actual_presence[chassis.uuid] = True
-                except exceptions.NotFound:
-                    actual_presence[chassis.uuid] = False
+                for chassis_uuid in chassis_uuids:
+                    try:
+                        self._client.get(chassis_uuid)
+                        actual_presence[chassis_uuid] = True
+                    except exceptions.NotFound:
+                        actual_presence[chassis_uuid] = False
+
+                return actual_presence
 
-            return waiter.expect_that(actual_presence,
-                                      equal_to(expected_presence))
+            listed_uuids = {chassis.uuid for chassis in self._client.list(
+                fields=['uuid'], limit=0)}
 
-        timeout = len(chassis_list) * chassis_timeout
-        waiter.wait(_check_chassis_presence, timeout_seconds=timeout)
+            return {chassis_uuid: chassis_uuid in listed_uuids
+                    for chassis_uuid in chassis_uuids}
+
+        deadline.wait_each(_get_chassis_presence,
+                           expected_presence,
+                           timeout_seconds=chassis_timeout)
+
+    @steps_checker.step
+    def set_chassis_power_state(self,
+                                chassis,
+                                state,
+                                wave_size=0,
+                                timeout=config.CHANGE_NODE_STATE_TIMEOUT):
+        """Step to set power state of all nodes of chassis.
+
+        Args:
+            chassis (object): ironic chassis
+            state (str): power verb, like 'on', 'off' or 'reboot'
+            wave_size (int): count of nodes changed at once, all nodes are
+                changed concurrently if it's 0
+            timeout (int): seconds to wait power transition of each node
+
+        Returns:
+            OrderedDict: seconds each node took to finish power transition
+        """
+        return self._apply_in_waves(
+            chassis,
+            lambda nodes: self.node_steps.set_ironic_nodes_power_state(
+                nodes, state=state, timeout=timeout),
+            "power '{}'".format(state),
+            wave_size=wave_size)
+
+    @steps_checker.step
+    def set_chassis_maintenance(self,
+                                chassis,
+                                state,
+                                reason=None,
+                                wave_size=0,
+                                timeout=config.CHANGE_NODE_STATE_TIMEOUT):
+        """Step to set maintenance of all nodes of chassis.
+
+        Args:
+            chassis (object): ironic chassis
+            state (bool): True to put nodes in maintenance mode
+            reason (str, optional): reason of maintenance
+            wave_size (int): count of nodes changed at once, all nodes are
+                changed concurrently if it's 0
+            timeout (int): seconds to wait maintenance change of each node
+
+        Returns:
+            OrderedDict: seconds each node took to change maintenance
+        """
+        return self._apply_in_waves(
+            chassis,
+            lambda nodes: self.node_steps.set_maintenance(
+                nodes, state=state, reason=reason, timeout=timeout),
+            "maintenance {}".format(state),
+            wave_size=wave_size)
+
+    @steps_checker.step
+    def set_chassis_provision_state(self,
+                                    chassis,
+                                    state,
+                                    wave_size=0,
+                                    timeout=config.CHANGE_NODE_STATE_TIMEOUT):
+        """Step to set provision state of all nodes of chassis.
+
+        Args:
+            chassis (object): ironic chassis
+            state (str): provision verb, like 'manage', 'provide' or 'active'
+            wave_size (int): count of nodes changed at once, all nodes are
+                changed concurrently if it's 0
+            timeout (int): seconds to wait provision state of each node
+
+        Returns:
+            OrderedDict: seconds each node took to reach provision state
+        """
+        return self._apply_in_waves(
+            chassis,
+            lambda nodes: self.node_steps.set_nodes_provision_state(
+                nodes, state=state, timeout=timeout),
+            "provision '{}'".format(state),
+            wave_size=wave_size)
 
     @steps_checker.step
     def get_ironic_chassis(self, check=True):
@@ -157,3 +430,19 @@ class IronicChassisSteps(BaseSteps):
             assert_that(chassis_list, is_not(empty()))
 
         return chassis_list
+
+    @steps_checker.step
+    def get_ironic_chassis_iterator(self, page_size=None, **kwargs):
+        """Step to iterate over chassis page by page.
+
+        Args:
+            page_size (int, optional): count of chassis got with single
+                request, `config.IRONIC_PAGE_SIZE` by default
+            **kwargs: other arguments of chassis listing, like `detail`
+
+        Returns:
+            generator: ironic chassis
+        """
+        return iterate_pages(self._client.list,
+                             page_size or config.IRONIC_PAGE_SIZE,
+                             **kwargs)
@@ -16,28 +16,275 @@ Ironic node steps
 # implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+
+import collections
+import logging
 import time
 
-from hamcrest import equal_to, assert_that, is_not, empty, has_key, contains_inanyorder, matches_regexp  # noqa
+from concurrent import futures
+
+from hamcrest import equal_to, assert_that, is_not, empty, contains_inanyorder, matches_regexp  # noqa
 
 from ironicclient import exceptions
 
 from spaced_armour_tests.ironic_underlay import config
+from spaced_armour_tests.ironic_underlay import planner
+from spaced_armour_tests.ironic_underlay import registry
+from spaced_armour_tests.ironic_underlay import states
 from stepler.base import BaseSteps
 from stepler.third_party import steps_checker
 from stepler.third_party import utils
-from stepler.third_party import waiter
 
+from third_party import deadline
+from third_party import parallel
+from third_party import patch as json_patch
+from third_party.utils import iterate_pages
+from third_party.utils import login_in_process
 from third_party.utils import ssh_connection
 
 __all__ = [
     'IronicNodeSteps'
 ]
 
+LOGGER = logging.getLogger(__name__)
+
+# Nodes filters supported by ironic API and their `node.list` arguments
+SERVER_NODE_FILTERS = {
+    'provision_state': 'provision_state',
+    'maintenance': 'maintenance',
+    'associated': 'associated',
+    'driver': 'driver',
+    'chassis_uuid': 'chassis',
+    'resource_class': 'resource_class',
+}
+
+_MISSING = object()
+
+# Enrolled attributes of node restored by `restore_nodes` and their values
+# if they aren't in nodes plan
+RESTORED_NODE_ATTRIBUTES = collections.OrderedDict([
+    ('chassis_uuid', None),
+    ('properties', {}),
+    ('extra', {}),
+])
+
+# Value ironic shows instead of secrets, like `driver_info/ipmi_password`
+MASKED_VALUE = '******'
+
+
+def _patch_value_matches(actual, expected):
+    """Check whether node value matches value of patch operation.
+
+    Masked secrets match any value.
+    """
+    if actual == MASKED_VALUE:
+        return True
+    if isinstance(actual, dict) and isinstance(expected, dict):
+        return (set(actual) == set(expected) and
+                all(_patch_value_matches(actual[key], expected[key])
+                    for key in expected))
+    return actual == expected
+
+
+def _is_patch_applied(document, operation):
+    """Check whether patch operation is applied to node document.
+
+    Returns:
+        bool: None if it can't be checked, because operation carries no
+            value, like 'move' or 'copy', or appends to list.
+    """
+    value = json_patch.get_path_value(document, operation['path'])
+    if operation['op'] == 'remove':
+        return value in (None, json_patch.MISSING)
+    if 'value' not in operation or operation['path'].endswith('/-'):
+        return None
+    return _patch_value_matches(value, operation['value'])
+
+
+def _split_nodes_filters(filters):
+    """Split nodes filters to server side and client side ones.
+
+    Args:
+        filters (dict): expected values of nodes attributes.
+
+    Returns:
+        tuple: `node.list` arguments and filters to match on client side.
+    """
+    server_filters = {}
+    client_filters = {}
+
+    for key, value in filters.items():
+        if key in SERVER_NODE_FILTERS:
+            server_filters[SERVER_NODE_FILTERS[key]] = value
+        else:
+            client_filters[key] = value
+
+    return server_filters, client_filters
+
+
+def _compile_nodes_matcher(filters):
+    """Compile function to match nodes attributes with filters.
+
+    Args:
+        filters (dict): expected values of nodes attributes.
+
+    Returns:
+        function: function returning True if node matches all filters.
+    """
+    items = tuple(filters.items())
+
+    def _match(node):
+        for key, value in items:
+            if getattr(node, key, _MISSING) != value:
+                return False
+        return True
+
+    return _match
+
 
 class IronicNodeSteps(BaseSteps):
     """Node steps."""
 
+    workers = config.IRONIC_API_WORKERS
+    ssh_pool = None
+    registry = None
+    port_index = None
+    # count of all nodes got by the last unfiltered list request
+    inventory_size = None
+
+    def _map_nodes(self, func, nodes):
+        """Call function for each node concurrently.
+
+        Args:
+            func (function): function to call with single ironic node.
+            nodes (list): list of ironic nodes.
+
+        Returns:
+            OrderedDict: results of calls by node uuid.
+
+        Raises:
+            ParallelExecutionError: if call failed for any node.
+        """
+        return parallel.parallel_map(func, nodes,
+                                     workers=self.workers,
+                                     key=lambda node: node.uuid)
+
+    def _evict_ssh_connections(self, nodes):
+        """Close pooled SSH connections broken by nodes state change."""
+        if self.ssh_pool is not None:
+            self.ssh_pool.evict([node.uuid for node in nodes])
+
+    def _check_nodes_ssh(self,
+                         nodes,
+                         timeout=config.SSH_TIMEOUT,
+                         processes=0,
+                         ip_addresses=None):
+        """Check instances of nodes are reachable via SSH.
+
+        Args:
+            nodes (list): the list of ironic nodes.
+            timeout (int): seconds to wait for successful login.
+            processes (int): count of worker processes for SSH handshakes;
+                pooled SSH connections aren't used if it's specified.
+            ip_addresses (list, optional): instances IP addresses in order
+                of nodes; they are got from nodes if not specified.
+
+        Returns:
+            OrderedDict: seconds to first successful login by host address.
+        """
+        if ip_addresses is None:
+            ip_addresses = self.get_instance_ipv4_addresses(nodes)
+
+        if processes:
+            pool = None
+        else:
+            pool = self.ssh_pool
+
+        if pool is not None:
+            for node, ip_address in zip(nodes, ip_addresses):
+                pool.assign(node.uuid, ip_address)
+
+        return ssh_connection(ipv4_addresses=ip_addresses,
+                              username=config.IMAGE_USERNAME,
+                              password=config.IMAGE_PASSWORD,
+                              timeout=timeout,
+                              pool=pool,
+                              processes=processes,
+                              workers=self.workers)
+
+    def _get_nodes_ports(self, nodes):
+        """Get ports of nodes with listing per node.
+
+        Args:
+            nodes (list): list of ironic nodes.
+
+        Returns:
+            OrderedDict: lists of ports with `uuid`, `address` and
+                `node_uuid` fields by node uuid.
+
+        Raises:
+            ParallelExecutionError: if ports weren't listed for any node.
+        """
+        return self._map_nodes(
+            lambda node: list(self._client.port.list(
+                node=node.uuid,
+                fields=['uuid', 'address', 'node_uuid'],
+                limit=0)),
+            nodes)
+
+    def _apply_provision_path(self, nodes, path, timeout=0):
+        """Apply provision verbs to nodes one by one.
+
+        Args:
+            nodes (list): the list of ironic nodes.
+            path (list): (verb, provision state) pairs like from
+                `planner.find_path`.
+            timeout (int): seconds to wait each provision state.
+        """
+        for verb, state in path:
+            self.set_nodes_provision_state(nodes, state=verb, check=False)
+            self.check_ironic_nodes_provision_state(nodes,
+                                                    state=state,
+                                                    node_timeout=timeout)
+
+    def _wait_plannable_states(self, nodes, targets, timeout=0):
+        """Wait until nodes leave transient provision states.
+
+        Args:
+            nodes (list): the list of ironic nodes.
+            targets (str|set): desired provision state or any of states.
+            timeout (int): seconds to wait for each node.
+
+        Returns:
+            dict: provision states by node uuid, state is None if node isn't
+                found.
+
+        Raises:
+            TimeoutExpired: if any node stayed in transient state.
+        """
+        nodes_by_uuid = {node.uuid: node for node in nodes}
+        provision_states = dict.fromkeys(nodes_by_uuid)
+
+        def _get_nodes_plannable(nodes_uuids):
+            snapshot = self._get_nodes_snapshot(
+                [nodes_by_uuid[node_uuid] for node_uuid in nodes_uuids],
+                fields=['provision_state'])
+            plannable = {}
+
+            for node_uuid, node in snapshot.items():
+                provision_states[node_uuid] = getattr(
+                    node, 'provision_state', None)
+                plannable[node_uuid] = node is None or planner.is_plannable(
+                    node.provision_state, targets)
+
+            return plannable
+
+        deadline.wait_each(_get_nodes_plannable,
+                           dict.fromkeys(nodes_by_uuid, True),
+                           timeout_seconds=timeout)
+
+        return provision_states
+
     @steps_checker.step
     def create_ironic_nodes(self,
                             driver='fake',
@@ -82,6 +329,9 @@ class IronicNodeSteps(BaseSteps):
             _nodes_names[node.uuid] = name
             nodes_list.append(node)
 
+        if self.registry is not None:
+            self.registry.add(registry.NODE, nodes_list)
+
         if check:
             self.check_ironic_nodes_presence(nodes_list)
             for node in nodes_list:
@@ -89,27 +339,239 @@ class IronicNodeSteps(BaseSteps):
 
         return nodes_list
 
+    @steps_checker.step
+    def enroll_nodes(self, nodes_plan, check=True):
+        """Step to enroll ironic nodes with their ports.
+
+        Nodes are created concurrently and ports of each node are created
+        as soon as the node exists. Presence of all nodes and ports is
+        checked once after enrolment.
+
+        Args:
+            nodes_plan (list): list of dicts with `addresses` key for MAC
+                addresses of node ports, optional `patch` key for JSON patch
+                applied right after node creation and attributes of node,
+                like `driver` and `driver_info`.
+            check (bool): flag whether to check step or not.
+
+        Returns:
+            list: list of enrolled ironic nodes in order of plan.
+
+        Raises:
+            ParallelExecutionError: if any node wasn't enrolled.
+            TimeoutExpired|AssertionError: if check failed after timeout.
+        """
+        nodes_names = list(utils.generate_ids(count=len(nodes_plan)))
+        expected_ports = {}
+
+        def _enroll_node(index):
+            node_attrs = dict(nodes_plan[index])
+            addresses = node_attrs.pop('addresses', [])
+            patch = node_attrs.pop('patch', None)
+            node_attrs.setdefault('name', nodes_names[index])
+
+            node = self._client.node.create(**node_attrs)
+            if self.registry is not None:
+                self.registry.add(registry.NODE, [node])
+
+            if patch:
+                node = self._client.node.update(node_id=node.uuid,
+                                                patch=patch)
+
+            for address in addresses:
+                port = self._client.port.create(address=address,
+                                                node_uuid=node.uuid)
+                if self.registry is not None:
+                    self.registry.add(registry.PORT, [port])
+                expected_ports[port.uuid] = (node.uuid, address.lower())
+
+            return node
+
+        start = time.time()
+        nodes = list(parallel.parallel_map(_enroll_node,
+                                           range(len(nodes_plan)),
+                                           workers=self.workers).values())
+        elapsed = time.time() - start
+
+        LOGGER.info("Enrolled %d node(s) with %d port(s) in %.1fs "
+                    "(%.2f nodes per second)",
+                    len(nodes), len(expected_ports), elapsed,
+                    len(nodes) / elapsed if elapsed else float('inf'))
+
+        if check:
+            self.check_ironic_nodes_presence(nodes)
+
+            # ironic keeps MAC addresses in lower case
+            actual_ports = {port.uuid: (port.node_uuid, port.address.lower())
+                            for ports in self._get_nodes_ports(nodes).values()
+                            for port in ports
+                            if port.uuid in expected_ports}
+            assert_that(actual_ports, equal_to(expected_ports))
+
+        return nodes
+
+    @steps_checker.step
+    def restore_nodes(self, nodes, nodes_plan, check=True):
+        """Step to restore enrolled definition of nodes.
+
+        Chassis, properties and extra changed by tests are reset to planned
+        ones and patch of plan is applied again, because ironic clears
+        `instance_info` on tear down. Changed attributes are sent with one
+        request per node. Ports are created or deleted to match planned MAC
+        addresses. Nodes are restored concurrently.
+
+        Args:
+            nodes (list): list of ironic nodes.
+            nodes_plan (list): plan of nodes like for `enroll_nodes` in
+                order of nodes.
+            check (bool): flag whether to check step or not.
+
+        Raises:
+            ParallelExecutionError: if any node wasn't restored.
+            AssertionError: if check failed.
+        """
+        plans = {node.uuid: node_plan
+                 for node, node_plan in zip(nodes, nodes_plan)}
+        fields = set(RESTORED_NODE_ATTRIBUTES)
+        for node_plan in nodes_plan:
+            fields.update(operation['path'].split('/')[1]
+                          for operation in node_plan.get('patch') or [])
+        snapshot = self._get_nodes_snapshot(nodes, fields=fields)
+        ports = self._get_nodes_ports(nodes)
+
+        operations = {}
+        expected_addresses = {}
+
+        def _restore_node(node):
+            node_plan = plans[node.uuid]
+            current = snapshot[node.uuid]
+            assert_that(current, is_not(None), "Node doesn't exist")
+            current = current.to_dict()
+
+            patch = []
+            for attribute, default in RESTORED_NODE_ATTRIBUTES.items():
+                value = node_plan.get(attribute, default)
+                if current.get(attribute) == value:
+                    continue
+                if value is None:
+                    patch.append({'op': 'remove',
+                                  'path': '/' + attribute})
+                else:
+                    patch.append({'op': 'replace',
+                                  'path': '/' + attribute,
+                                  'value': value})
+
+            # operations which can't be checked are applied each time
+            for operation in node_plan.get('patch') or []:
+                if not _is_patch_applied(current, operation):
+                    patch.append(operation)
+
+            if patch:
+                self._client.node.update(node_id=node.uuid, patch=patch)
+                operations[node.uuid] = patch
+
+            # ironic keeps MAC addresses in lower case
+            addresses = {address.lower()
+                         for address in node_plan.get('addresses', [])}
+            expected_addresses[node.uuid] = addresses
+            missing_addresses = set(addresses)
+
+            for port in ports[node.uuid]:
+                if port.address.lower() in addresses:
+                    missing_addresses.discard(port.address.lower())
+                    continue
+                self._client.port.delete(port.uuid)
+                if self.port_index is not None:
+                    self.port_index.discard([port.uuid])
+                if self.registry is not None:
+                    self.registry.discard(registry.PORT, [port.uuid])
+
+            for address in sorted(missing_addresses):
+                port = self._client.port.create(address=address,
+                                                node_uuid=node.uuid)
+                if self.registry is not None:
+                    self.registry.add(registry.PORT, [port])
+
+        self._map_nodes(_restore_node, nodes)
+
+        if check:
+            if operations:
+                self._check_nodes_patch(
+                    [node for node in nodes if node.uuid in operations],
+                    operations)
+
+            actual_addresses = {
+                node_uuid: {port.address.lower() for port in node_ports}
+                for node_uuid, node_ports in self._get_nodes_ports(
+                    nodes).items()}
+            assert_that(actual_addresses, equal_to(expected_addresses))
+
     @steps_checker.step
     def delete_ironic_nodes(self, nodes, check=True):
         """Step to delete node.
 
+        Each node goes through teardown on its own: it's undeployed if its
+        provision state doesn't allow deleting, powered off if it's powered
+        on and deleted. Nodes in maintenance are force-deleted: they aren't
+        undeployed and powered off, because ironic allows to delete them in
+        any state and their BMC may be broken.
+
         Args:
             nodes (list): list of ironic nodes.
             check (bool): flag whether to check step or not.
+
+        Raises:
+            ParallelExecutionError: if any node wasn't deleted.
         """
-        for node in nodes:
-            node = self._get_node(node.uuid)
+        snapshot = self._get_nodes_snapshot(
+            nodes, fields=['provision_state', 'power_state', 'maintenance'])
+
+        def _delete_node(node):
+            node = snapshot[node.uuid]
+            if node is None:
+                return
+
+            # nodes in maintenance are force-deleted in any state
+            force = node.maintenance
+
+            if not (force or node.provision_state in
+                    states.DELETE_ALLOWED_PROVISION_STATES):
+                provision_state = self._wait_plannable_states(
+                    [node],
+                    states.DELETE_ALLOWED_PROVISION_STATES,
+                    timeout=config.CHANGE_NODE_STATE_TIMEOUT)[node.uuid]
+                if provision_state is None:
+                    return
+
+                self._apply_provision_path(
+                    [node],
+                    planner.find_path(provision_state,
+                                      states.DELETE_ALLOWED_PROVISION_STATES),
+                    timeout=config.CHANGE_NODE_STATE_TIMEOUT)
+                node = self._get_nodes_snapshot(
+                    [node], fields=['power_state'])[node.uuid]
+
+            if not force and node.power_state not in (None, 'power off'):
+                self.set_ironic_nodes_power_state(
+                    [node],
+                    state='off',
+                    timeout=config.CHANGE_NODE_STATE_TIMEOUT)
 
-            if node.provision_state not in (
-                    'available', 'manageable', 'enroll', 'adopt failed'):
-                self.set_nodes_provision_state([node],
-                                               state='deleted',
-                                               check=False)
+            self._client.node.delete(node.uuid)
 
-            if node.power_state not in ('None', 'off'):
-                self.set_ironic_nodes_power_state([node], state='off')
+        self._evict_ssh_connections(nodes)
+        self._map_nodes(_delete_node, nodes)
 
-            self._client.node.delete(node.uuid)
+        if self.port_index is not None:
+            self.port_index.discard_nodes([node.uuid for node in nodes])
+
+        if self.registry is not None:
+            nodes_uuids = {node.uuid for node in nodes}
+            self.registry.discard(registry.NODE, nodes_uuids)
+            self.registry.discard(
+                registry.PORT,
+                [port.uuid for port in self.registry.get(registry.PORT)
+                 if port.node_uuid in nodes_uuids])
 
         if check:
             self.check_ironic_nodes_presence(nodes, must_present=False)
@@ -124,28 +586,25 @@ class IronicNodeSteps(BaseSteps):
         Args:
             nodes (list): list of ironic nodes.
             must_present (bool): flag whether node should present or not.
-            node_timeout (int): seconds to wait a result of check.
+            node_timeout (int): seconds to wait a result of check for
+                each node.
 
         Raises:
             TimeoutExpired: if check failed after timeout.
         """
         expected_presence = {node.uuid: must_present for node in nodes}
+        nodes_by_uuid = {node.uuid: node for node in nodes}
 
-        def _check_ironic_nodes_presence():
-            actual_presence = {}
-
-            for node in nodes:
-                try:
-                    self._client.node.get(node.uuid)
-                    actual_presence[node.uuid] = True
-                except exceptions.NotFound:
-                    actual_presence[node.uuid] = False
-
-            return waiter.expect_that(actual_presence,
-                                      equal_to(expected_presence))
+        def _get_ironic_nodes_presence(nodes_uuids):
+            snapshot = self._get_nodes_snapshot(
+                [nodes_by_uuid[node_uuid] for node_uuid in nodes_uuids],
+                fields=['uuid'])
+            return {node_uuid: node is not None
+                    for node_uuid, node in snapshot.items()}
 
-        timeout = len(nodes) * node_timeout
-        waiter.wait(_check_ironic_nodes_presence, timeout_seconds=timeout)
+        deadline.wait_each(_get_ironic_nodes_presence,
+                           expected_presence,
+                           timeout_seconds=node_timeout)
 
     @steps_checker.step
     def set_maintenance(self,
@@ -167,17 +626,22 @@ class IronicNodeSteps(BaseSteps):
             check (bool): flag whether to check step or not.
             timeout (int): seconds to wait a result of check.
 
+        Returns:
+            dict: seconds each node took to change maintenance, None if
+                check is disabled.
+
         Raises:
-            InvalidAttribute: if state is an invalid string.
+            ParallelExecutionError: if state wasn't set for any node, e.g.
+                with InvalidAttribute if state is an invalid string.
         """
-        for node in nodes:
-            self._client.node.set_maintenance(node_id=node.uuid,
-                                              state=state,
-                                              maint_reason=reason)
+        self._map_nodes(
+            lambda node: self._client.node.set_maintenance(
+                node_id=node.uuid, state=state, maint_reason=reason),
+            nodes)
         if check:
-            self.check_ironic_nodes_maintenance(nodes=nodes,
-                                                state=state,
-                                                node_timeout=timeout)
+            return self.check_ironic_nodes_maintenance(nodes=nodes,
+                                                       state=state,
+                                                       node_timeout=timeout)
 
     @steps_checker.step
     def check_ironic_nodes_maintenance(self,
@@ -192,27 +656,21 @@ class IronicNodeSteps(BaseSteps):
                 representation of a Boolean (eg, 'true', 'on', 'false',
                 'off'). True to put the node in maintenance mode; False
                 to take the node out of maintenance mode.
-            node_timeout (int): seconds to wait a result of check.
+            node_timeout (int): seconds to wait a result of check for
+                each node.
+
+        Returns:
+            dict: seconds each node took to change maintenance.
 
         Raises:
             TimeoutExpired: if check failed after timeout.
         """
         expected_maintenance = {node.uuid: state for node in nodes}
 
-        def _check_ironic_node_maintenance():
-            actual_maintenance = {}
-            for node in nodes:
-                try:
-                    node = self._get_node(node.uuid)
-                    actual_maintenance[node.uuid] = node.maintenance
-                except exceptions.NotFound:
-                    actual_maintenance[node.uuid] = None
-
-            return waiter.expect_that(actual_maintenance,
-                                      equal_to(expected_maintenance))
-
-        timeout = len(nodes) * node_timeout
-        waiter.wait(_check_ironic_node_maintenance, timeout_seconds=timeout)
+        return deadline.wait_each(
+            lambda _: self._get_nodes_attribute(nodes, 'maintenance'),
+            expected_maintenance,
+            timeout_seconds=node_timeout)
 
     @steps_checker.step
     def set_ironic_nodes_power_state(self,
@@ -230,106 +688,250 @@ class IronicNodeSteps(BaseSteps):
             check (bool): flag whether to check step or not.
             timeout (int): seconds to wait a result of changing state.
 
+        Returns:
+            dict: seconds each node took to finish power transition, None
+                if check is disabled.
+
         Raises:
-            InvalidAttribute: if state is an invalid string.
+            ParallelExecutionError: if state wasn't set for any node, e.g.
+                with InvalidAttribute if state is an invalid string.
         """
-        for node in nodes:
-            self._client.node.set_power_state(node_id=node.uuid, state=state)
+        if check:
+            updated_before = self._get_nodes_attribute(nodes, 'updated_at')
+
+        self._evict_ssh_connections(nodes)
+        self._map_nodes(
+            lambda node: self._client.node.set_power_state(
+                node_id=node.uuid, state=state),
+            nodes)
 
         if check:
-            self.check_ironic_nodes_power_state(nodes=nodes,
-                                                state=state,
-                                                node_timeout=timeout)
+            return self.check_ironic_nodes_power_state(
+                nodes=nodes,
+                state=state,
+                node_timeout=timeout,
+                updated_before=updated_before)
 
     @steps_checker.step
     def check_ironic_nodes_power_state(self,
                                        nodes,
                                        state,
-                                       node_timeout=0):
+                                       node_timeout=0,
+                                       updated_before=None):
         """Check ironic node power state was changed.
 
+        Power transition is finished when ironic clears node
+        `target_power_state`. If node update time before the power action
+        is known, node must also be updated since then, so the check
+        doesn't pass before ironic starts the transition, e.g. on reboot.
+
         Args:
             nodes (list): The list of ironic nodes.
             state (string): the power state mode; `on` to put the node in power
                 state mode on; `off` to put the node in power state mode off;
                 `reboot` to reboot the node.
-            node_timeout (int): seconds to wait a result of check.
+            node_timeout (int): seconds to wait a result of check for
+                each node.
+            updated_before (dict, optional): node `updated_at` values taken
+                before the power action by node uuid.
+
+        Returns:
+            dict: seconds each node took to finish power transition.
 
         Raises:
             TimeoutExpired: if check failed after timeout.
         """
-        target_state = state
-
-        if target_state == 'off':
-            time.sleep(config.REBOOT_TIMEOUT)
-            expected_state = 'power off'
-        elif target_state == 'on':
-            expected_state = 'power on'
-        elif target_state == 'soft off':
-            expected_state = 'power off'
-        elif target_state == 'reboot':
-            time.sleep(config.REBOOT_TIMEOUT)
-            expected_state = 'power on'
-        elif target_state == 'soft reboot':
-            time.sleep(config.REBOOT_TIMEOUT)
-            expected_state = 'power on'
-        else:
-            expected_state = target_state
+        expected_state = states.get_expected_power_state(state)
+        updated_before = updated_before or {}
 
         expected_power_state = {node.uuid: expected_state for node in nodes}
+        drivers = {}
 
-        def _check_ironic_nodes_power_state():
+        def _get_ironic_nodes_power_state(_):
+            snapshot = self._get_nodes_snapshot(
+                nodes, fields=['power_state', 'target_power_state',
+                               'updated_at', 'driver'])
             actual_power_state = {}
-            for node in nodes:
-                try:
-                    node = self._get_node(node.uuid)
-                    actual_power_state[node.uuid] = node.power_state
 
-                except exceptions.NotFound:
-                    actual_power_state[node.uuid] = None
+            for node_uuid, node in snapshot.items():
+                if not node:
+                    continue
+
+                drivers[node_uuid] = node.driver
+                if node.target_power_state:
+                    actual_power_state[node_uuid] = '{0} -> {1}'.format(
+                        node.power_state, node.target_power_state)
+                elif (node_uuid in updated_before and
+                        node.updated_at == updated_before[node_uuid]):
+                    actual_power_state[node_uuid] = '{0} (not changed)'.format(
+                        node.power_state)
+                else:
+                    actual_power_state[node_uuid] = node.power_state
 
-            return waiter.expect_that(actual_power_state,
-                                      equal_to(expected_power_state))
+            return actual_power_state
 
-        timeout = len(nodes) * node_timeout
-        waiter.wait(_check_ironic_nodes_power_state, timeout_seconds=timeout)
+        latencies = deadline.wait_each(_get_ironic_nodes_power_state,
+                                       expected_power_state,
+                                       timeout_seconds=node_timeout)
+
+        for node_uuid, latency in sorted(latencies.items()):
+            LOGGER.info("Node %s with driver '%s' finished power '%s' in "
+                        "%.1f second(s)", node_uuid, drivers.get(node_uuid),
+                        state, latency)
+
+        return latencies
 
     def _get_node(self, node_uuid):
         return self._client.node.get(node_uuid)
 
+    def _get_nodes_snapshot(self, nodes, fields=None, **filters):
+        """Get watched nodes with single list request.
+
+        Nodes without filters are got with concurrent get requests if their
+        count is less than `config.IRONIC_LIST_THRESHOLD` or they are less
+        than `1 / config.IRONIC_LIST_RATIO` of all nodes, so shared
+        inventory isn't listed for few watched nodes.
+
+        Args:
+            nodes (list): list of watched ironic nodes.
+            fields (list, optional): node fields to retrieve, node uuid is
+                always retrieved; all fields are retrieved if not specified.
+            **filters: server side filters of nodes listing, like
+                `associated`, `maintenance` or `provision_state`.
+
+        Returns:
+            dict: ironic nodes by uuid, node is None if it isn't listed.
+        """
+        if fields:
+            fields = sorted(set(fields) | {'uuid'})
+
+        snapshot = dict.fromkeys(node.uuid for node in nodes)
+
+        if not filters and not self._should_list_nodes(len(snapshot)):
+            def _get_node(node_uuid):
+                try:
+                    return self._client.node.get(node_uuid, fields=fields)
+                except exceptions.NotFound:
+                    return None
+
+            snapshot.update(parallel.parallel_map(_get_node, snapshot,
+                                                  workers=self.workers))
+            return snapshot
+
+        if fields:
+            listed_nodes = self._client.node.list(fields=fields, limit=0,
+                                                  **filters)
+        else:
+            listed_nodes = self._client.node.list(detail=True, limit=0,
+                                                  **filters)
+
+        if not filters:
+            listed_nodes = list(listed_nodes)
+            self.inventory_size = len(listed_nodes)
+
+        for node in listed_nodes:
+            if node.uuid in snapshot:
+                snapshot[node.uuid] = node
+
+        return snapshot
+
+    def _should_list_nodes(self, count):
+        """Check whether watched nodes should be got with list request.
+
+        Args:
+            count (int): count of watched nodes.
+
+        Returns:
+            bool: True if nodes should be listed, False if they should be
+                got one by one.
+        """
+        if count < config.IRONIC_LIST_THRESHOLD:
+            return False
+        if self.inventory_size is None:
+            return True
+        return count * config.IRONIC_LIST_RATIO >= self.inventory_size
+
+    def _get_nodes_attribute(self, nodes, attribute, **filters):
+        """Get attribute value of watched nodes with single list request.
+
+        Args:
+            nodes (list): list of watched ironic nodes.
+            attribute (string): the node attribute.
+            **filters: server side filters of nodes listing.
+
+        Returns:
+            dict: attribute values by node uuid, value is None if node
+                isn't listed.
+        """
+        snapshot = self._get_nodes_snapshot(nodes, fields=[attribute],
+                                            **filters)
+        return {uuid: getattr(node, attribute) if node else None
+                for uuid, node in snapshot.items()}
+
     @steps_checker.step
     def get_ironic_nodes(self, check=True, **kwargs):
         """Step to retrieve nodes.
 
+        Filters supported by ironic API are applied on server side, the
+        rest ones are matched with nodes attributes on client side.
+
         Args:
             check (bool): flag whether to check step or not.
+            **kwargs: like: {'name': 'test_node', 'provision_state': 'active'}
 
         Returns:
             list of objects: list of nodes.
-            **kwargs: like: {'name': 'test_node', 'status': 'active'}
 
         Raises:
             AssertionError: if nodes collection is empty.
         """
-        nodes = self._client.node.list(**kwargs)
+        server_filters, client_filters = _split_nodes_filters(kwargs)
 
-        if kwargs:
-            matched_nodes = []
-            for node in nodes:
-                node_dict = node.to_dict()
-                for key, value in kwargs.items():
-                    if not (key in node_dict and node_dict[key] == value):
-                        break
-                else:
-                    matched_nodes.append(node)
-
-            nodes = matched_nodes
+        if client_filters:
+            match = _compile_nodes_matcher(client_filters)
+            nodes = self._client.node.list(detail=True, **server_filters)
+            nodes = [node for node in nodes if match(node)]
+        else:
+            nodes = self._client.node.list(**server_filters)
 
         if check:
             assert_that(nodes, is_not(empty()))
 
         return nodes
 
+    @steps_checker.step
+    def get_ironic_nodes_iterator(self, page_size=None, fields=None, **kwargs):
+        """Step to iterate over nodes page by page.
+
+        Filters are applied like in `get_ironic_nodes`.
+
+        Args:
+            page_size (int, optional): count of nodes got with single
+                request, `config.IRONIC_PAGE_SIZE` by default.
+            fields (list, optional): node fields to retrieve, fields of
+                client side filters are added to them.
+            **kwargs: like: {'name': 'test_node', 'provision_state': 'active'}
+
+        Returns:
+            generator: nodes.
+        """
+        server_filters, client_filters = _split_nodes_filters(kwargs)
+        if fields:
+            server_filters['fields'] = sorted(
+                set(fields) | set(client_filters) | {'uuid'})
+        elif client_filters:
+            server_filters['detail'] = True
+
+        nodes = iterate_pages(self._client.node.list,
+                              page_size or config.IRONIC_PAGE_SIZE,
+                              **server_filters)
+
+        if client_filters:
+            match = _compile_nodes_matcher(client_filters)
+            nodes = (node for node in nodes if match(node))
+
+        return nodes
+
     @steps_checker.step
     def get_ironic_node(self, node, check=True):
         """Get node by provided uuid.
@@ -381,54 +983,46 @@ class IronicNodeSteps(BaseSteps):
     def check_ironic_nodes_provision_state(self,
                                            nodes,
                                            state,
-                                           node_timeout=0):
+                                           node_timeout=0,
+                                           on_reached=None):
         """Check ironic node provision state was changed.
 
         Args:
             nodes (list): the list of ironic nodes.
             state (string): the provision state mode.
-            node_timeout (int): seconds to wait a result of check.
+            node_timeout (int): seconds to wait a result of check for
+                each node.
+            on_reached (function, optional): function called with node uuid
+                as soon as node reaches expected provision state.
+
+        Returns:
+            dict: seconds each node took to reach expected provision state.
 
         Raises:
             TimeoutExpired: if check failed after timeout.
+            NodesProvisionFailed: if any node went to failure state.
         """
-
-        target_state = state
-        if target_state == 'deleted':
-            expected_state = 'available'
-
-        elif target_state == 'provide':
-            expected_state = 'available'
-
-        elif target_state == 'manage':
-            expected_state = 'manageable'
-
-        elif target_state == 'inspect':
-            expected_state = 'manageable'
-
-        else:
-            expected_state = target_state
+        expected_state = states.get_expected_provision_state(state)
 
         expected_provision_state = {
             node.uuid: expected_state for node in nodes}
 
-        def _check_ironic_nodes_provision_state():
-            actual_provision_state = {}
-
-            for node in nodes:
-                try:
-                    node = self._get_node(node.uuid)
-                    actual_provision_state[node.uuid] = node.provision_state
+        def _get_ironic_nodes_provision_state(_):
+            snapshot = self._get_nodes_snapshot(
+                nodes, fields=['provision_state', 'last_error'])
+            listed_nodes = [node for node in snapshot.values() if node]
 
-                except exceptions.NotFound:
-                    actual_provision_state[node.uuid] = None
+            failures = states.get_provision_failures(listed_nodes,
+                                                     expected_state)
+            if failures:
+                raise states.NodesProvisionFailed(expected_state, failures)
 
-            return waiter.expect_that(actual_provision_state,
-                                      equal_to(expected_provision_state))
+            return {node.uuid: node.provision_state for node in listed_nodes}
 
-        timeout = len(nodes) * node_timeout
-        waiter.wait(_check_ironic_nodes_provision_state,
-                    timeout_seconds=timeout)
+        return deadline.wait_each(_get_ironic_nodes_provision_state,
+                                  expected_provision_state,
+                                  timeout_seconds=node_timeout,
+                                  on_reached=on_reached)
 
     @steps_checker.step
     def get_node_by_instance_uuid(self, server_uuid, check=True):
@@ -463,7 +1057,8 @@ class IronicNodeSteps(BaseSteps):
             nodes (list): the list of ironic nodes.
             attribute (string): the node attribute.
             expected_value (string): the value of the node attribute.
-            node_timeout (int): seconds to wait a result of check.
+            node_timeout (int): seconds to wait a result of check for
+                each node.
 
         Raises:
             TimeoutExpired: if check failed after timeout.
@@ -471,23 +1066,10 @@ class IronicNodeSteps(BaseSteps):
         expected_attribute_value = {node.uuid:
                                     expected_value for node in nodes}
 
-        def _check_ironic_nodes_attribute_value():
-            actual_attribute_value = {}
-            for node in nodes:
-                try:
-                    self._get_node(node.uuid)
-                    actual_attribute_value[node.uuid] = getattr(node,
-                                                                attribute)
-
-                except exceptions.NotFound:
-                    actual_attribute_value[node.uuid] = None
-
-            return waiter.expect_that(actual_attribute_value,
-                                      equal_to(expected_attribute_value))
-
-        timeout = len(nodes) * node_timeout
-        waiter.wait(_check_ironic_nodes_attribute_value,
-                    timeout_seconds=timeout)
+        deadline.wait_each(
+            lambda _: self._get_nodes_attribute(nodes, attribute),
+            expected_attribute_value,
+            timeout_seconds=node_timeout)
 
     @steps_checker.step
     def update_nodes(self, nodes, patch, check=True):
@@ -499,17 +1081,74 @@ class IronicNodeSteps(BaseSteps):
             check (bool): flag whether to check step or not.
 
         Raises:
+            ParallelExecutionError: if update request failed for any node.
             AssertionError: if node wasn't updated.
         """
-        for node in nodes:
-            self._client.node.update(node_id=node.uuid, patch=patch)
+        nodes_patch = json_patch.PatchAccumulator()
+        nodes_patch.add(nodes, patch)
+        self.apply_nodes_patch(nodes_patch, check=check)
+
+    @steps_checker.step
+    def apply_nodes_patch(self, nodes_patch, check=True):
+        """Step to send accumulated patch with one request per node.
+
+        Requests for different nodes are sent concurrently.
+
+        Args:
+            nodes_patch (PatchAccumulator): accumulated patch of nodes.
+            check (bool): flag whether to check step or not.
+
+        Returns:
+            list: updated ironic nodes.
+
+        Raises:
+            ParallelExecutionError: if update request failed for any node.
+            AssertionError: if node wasn't updated.
+        """
+        operations = nodes_patch.pop()
+
+        nodes = parallel.parallel_map(
+            lambda node_uuid: self._client.node.update(
+                node_id=node_uuid, patch=operations[node_uuid]),
+            operations,
+            workers=self.workers)
+        nodes = list(nodes.values())
 
         if check:
-            for node in nodes:
-                self._get_node(node.uuid)
-                item_to_update = patch[0]['path'].split('/')[1]
+            self._check_nodes_patch(nodes, operations)
+
+        return nodes
+
+    def _check_nodes_patch(self, nodes, operations):
+        """Check that patch operations are applied to nodes.
 
-                assert_that(node.to_dict(), has_key(item_to_update))
+        Only patched top-level fields of patched nodes are retrieved.
+
+        Args:
+            nodes (list): the list of patched ironic nodes.
+            operations (dict): lists of JSON patch operations by node uuid.
+
+        Raises:
+            AssertionError: if any node is absent or wasn't updated.
+        """
+        fields = {operation['path'].split('/')[1]
+                  for patch in operations.values() for operation in patch}
+        snapshot = self._get_nodes_snapshot(nodes, fields=fields)
+
+        mismatches = []
+        for node_uuid, patch in operations.items():
+            node = snapshot[node_uuid]
+            assert_that(node, is_not(None),
+                        "Node {} doesn't exist".format(node_uuid))
+
+            node = node.to_dict()
+            for operation in patch:
+                if _is_patch_applied(node, operation) is False:
+                    mismatches.append((
+                        node_uuid, operation['path'],
+                        json_patch.get_path_value(node, operation['path'])))
+
+        assert_that(mismatches, empty())
 
     @steps_checker.step
     def validate_nodes(self, nodes):
@@ -541,8 +1180,7 @@ class IronicNodeSteps(BaseSteps):
         Raises:
             AssertionError: if node is not ready.
         """
-        self.set_nodes_provision_state(nodes, state='manage', check=False)
-        self.check_ironic_nodes_provision_state(nodes, state='manageable')
+        self.move_nodes_to_state(nodes, state='manageable')
 
         current_properties = {node.uuid: node.properties for node in nodes}
         for prop in current_properties.values():
@@ -578,16 +1216,112 @@ class IronicNodeSteps(BaseSteps):
             check (bool): flag whether to check step or not.
             timeout (int): seconds to wait a result of change state.
 
+        Returns:
+            dict: seconds each node took to reach expected provision state,
+                None if check is disabled.
+
         Raises:
+            ParallelExecutionError: if state wasn't set for any node.
             AssertionError: if state wasn't applied.
         """
-        for node in nodes:
-            self._client.node.set_provision_state(node_uuid=node.uuid,
-                                                  state=state)
+        self._evict_ssh_connections(nodes)
+        self._map_nodes(
+            lambda node: self._client.node.set_provision_state(
+                node_uuid=node.uuid, state=state),
+            nodes)
         if check:
-            self.check_ironic_nodes_provision_state(nodes=nodes,
-                                                    state=state,
-                                                    node_timeout=timeout)
+            return self.check_ironic_nodes_provision_state(
+                nodes=nodes,
+                state=state,
+                node_timeout=timeout)
+
+    @steps_checker.step
+    def move_nodes_to_state(self,
+                            nodes,
+                            state,
+                            timeout=config.CHANGE_NODE_STATE_TIMEOUT):
+        """Step to bring nodes to provision state with minimal transitions.
+
+        The shortest path of provision verbs is planned for each node from
+        its current state. Nodes in transient states, like 'cleaning', are
+        waited to leave them first. Nodes which are already in the state are
+        skipped, nodes sharing a path go through it together and different
+        paths are applied concurrently.
+
+        Args:
+            nodes (list): the list of ironic nodes.
+            state (str): desired stable provision state, like 'available'.
+            timeout (int): seconds to wait each provision state on the path.
+
+        Returns:
+            OrderedDict: nodes uuids by applied path.
+
+        Raises:
+            TimeoutExpired: if any node stayed in transient state.
+            ValueError: if state can't be reached for any node.
+            ParallelExecutionError: if any path failed.
+        """
+        paths = planner.plan_paths(
+            self._wait_plannable_states(nodes, state, timeout=timeout),
+            state)
+        nodes_by_uuid = {node.uuid: node for node in nodes}
+
+        def _apply_path(path):
+            LOGGER.info("Applying %s to %d node(s)",
+                        ' -> '.join(verb for verb, _ in path),
+                        len(paths[path]))
+            self._apply_provision_path(
+                [nodes_by_uuid[node_uuid] for node_uuid in paths[path]],
+                path,
+                timeout=timeout)
+
+        parallel.parallel_map(_apply_path, paths, workers=len(paths))
+
+        return paths
+
+    @steps_checker.step
+    def reset_nodes(self, nodes, timeout=config.CHANGE_NODE_STATE_TIMEOUT):
+        """Step to bring nodes back to 'available' provision state.
+
+        Each node goes on its own: maintenance is cleared, node is waited to
+        leave transient provision state and the shortest path of provision
+        verbs is applied from its current state to 'available'. Nodes which
+        can't be reset don't break the rest of nodes.
+
+        Args:
+            nodes (list): the list of ironic nodes.
+            timeout (int): seconds to wait each provision verb result.
+
+        Returns:
+            OrderedDict: errors of nodes which weren't reset by node uuid.
+        """
+        snapshot = self._get_nodes_snapshot(
+            nodes, fields=['provision_state', 'maintenance'])
+
+        def _reset_node(node):
+            node = snapshot[node.uuid]
+            assert_that(node, is_not(None), "Node doesn't exist")
+
+            if node.maintenance:
+                self.set_maintenance([node], state=False)
+
+            provision_state = self._wait_plannable_states(
+                [node], 'available', timeout=timeout)[node.uuid]
+            assert_that(provision_state, is_not(None), "Node doesn't exist")
+
+            self._apply_provision_path(
+                [node],
+                planner.find_path(provision_state, 'available'),
+                timeout=timeout)
+
+        try:
+            self._map_nodes(_reset_node, nodes)
+        except parallel.ParallelExecutionError as e:
+            for node_uuid, error in e.errors.items():
+                LOGGER.warning("Node %s wasn't reset: %r", node_uuid, error)
+            return e.errors
+
+        return collections.OrderedDict()
 
     @steps_checker.step
     def clean_nodes(self, nodes, cleansteps, check=True, timeout=0):
@@ -602,6 +1336,7 @@ class IronicNodeSteps(BaseSteps):
         Raises:
             AssertionError: if clean goes to fail.
         """
+        self._evict_ssh_connections(nodes)
         for node in nodes:
             node = self._get_node(node.uuid)
             self._client.node.set_provision_state(node_uuid=node.uuid,
@@ -613,7 +1348,7 @@ class IronicNodeSteps(BaseSteps):
                                                     node_timeout=timeout)
 
     @steps_checker.step
-    def boot_servers(self, nodes):
+    def boot_servers(self, nodes, processes=None):
         """Step to boot ironic nodes.
 
         #. Set ironic nodes state 'active'
@@ -621,38 +1356,138 @@ class IronicNodeSteps(BaseSteps):
         #. Get instances IP addresses
         #. Check instances are reachable via IP
 
+        Each node goes to IP lookup and SSH check as soon as it becomes
+        'active', without waiting for the rest of nodes.
+
+        Args:
+            nodes (list): the list of ironic nodes.
+            processes (int, optional): count of worker processes for SSH
+                handshakes, `config.SSH_PROCESS_WORKERS` by default; threads
+                of test process are used if it's 0.
+
         Returns:
-            list of objects: ironic nodes
-        """
-        self.set_nodes_provision_state(nodes, state='active', check=False)
+            OrderedDict: (time to 'active', time to SSH) in seconds by node
+                uuid.
 
-        self.check_ironic_nodes_provision_state(
-            nodes,
-            state='active',
-            node_timeout=config.CHANGE_NODE_STATE_TIMEOUT)
+        Raises:
+            TimeoutExpired: if any node didn't become 'active' in time.
+            ParallelExecutionError: if SSH check failed for any node.
+        """
+        if not nodes:
+            return collections.OrderedDict()
+
+        if processes is None:
+            processes = config.SSH_PROCESS_WORKERS
+
+        nodes_by_uuid = {node.uuid: node for node in nodes}
+        time_to_active = {}
+        ssh_checks = []
+
+        def _check_ssh(node_uuid):
+            node = nodes_by_uuid[node_uuid]
+            if processes_executor is None:
+                self._check_nodes_ssh([node])
+            else:
+                login_in_process(processes_executor,
+                                 self.get_instance_ipv4_addresses([node])[0],
+                                 username=config.IMAGE_USERNAME,
+                                 password=config.IMAGE_PASSWORD,
+                                 timeout=config.SSH_TIMEOUT)
+            return time.time() - start
 
-        ip_addresses = self.get_instance_ipv4_addresses(nodes)
+        self.set_nodes_provision_state(nodes, state='active', check=False)
+        start = time.time()
+
+        workers = max(1, min(self.workers, len(nodes)))
+        processes_executor = None
+        if processes:
+            processes_executor = futures.ProcessPoolExecutor(
+                max_workers=min(processes, len(nodes)))
+
+        try:
+            with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+
+                def _start_ssh_check(node_uuid):
+                    time_to_active[node_uuid] = time.time() - start
+                    ssh_checks.append(
+                        (node_uuid, executor.submit(_check_ssh, node_uuid)))
+
+                self.check_ironic_nodes_provision_state(
+                    nodes,
+                    state='active',
+                    node_timeout=config.CHANGE_NODE_STATE_TIMEOUT,
+                    on_reached=_start_ssh_check)
+
+                time_to_ssh = parallel.collect_results(ssh_checks)
+        finally:
+            if processes_executor is not None:
+                processes_executor.shutdown()
+
+        timings = collections.OrderedDict()
+        for node in nodes:
+            timings[node.uuid] = (time_to_active[node.uuid],
+                                  time_to_ssh[node.uuid])
+            LOGGER.info("Node %s became 'active' in %.1f second(s) and "
+                        "reachable via SSH in %.1f second(s)",
+                        node.uuid, *timings[node.uuid])
 
-        ssh_connection(ipv4_addresses=ip_addresses,
-                       username=config.IMAGE_USERNAME,
-                       password=config.IMAGE_PASSWORD,
-                       timeout=config.SSH_TIMEOUT)
+        return timings
 
     @steps_checker.step
-    def check_ssh_connection(self, nodes):
+    def check_ssh_connection(self, nodes, processes=None):
         """Step to check ssh connection to instance.
 
         Args:
             nodes (list): the list of ironic nodes.
+            processes (int, optional): count of worker processes for SSH
+                handshakes, `config.SSH_PROCESS_WORKERS` by default; threads
+                of test process are used if it's 0.
+
+        Returns:
+            OrderedDict: seconds to first successful login by host address.
 
         Raises:
-            AssertionError: if ssh connection wasn't established.
+            ParallelExecutionError: if ssh connection wasn't established.
         """
-        ip_addresses = self.get_instance_ipv4_addresses(nodes)
-        ssh_connection(ipv4_addresses=ip_addresses,
-                       username=config.IMAGE_USERNAME,
-                       password=config.IMAGE_PASSWORD,
-                       timeout=config.SSH_TIMEOUT)
+        if processes is None:
+            processes = config.SSH_PROCESS_WORKERS
+
+        return self._check_nodes_ssh(nodes, processes=processes)
+
+    @steps_checker.step
+    def get_ssh_unreachable_nodes(self, nodes, timeout=config.SSH_TIMEOUT):
+        """Step to get nodes which instances aren't reachable via SSH.
+
+        Instances IP addresses are got with single snapshot of nodes.
+
+        Args:
+            nodes (list): the list of ironic nodes.
+            timeout (int): seconds to wait for successful login.
+
+        Returns:
+            list: nodes without instance IP address or which instances
+                aren't reachable via SSH.
+        """
+        instances_info = self._get_nodes_attribute(nodes, 'instance_info')
+        unreachable_nodes = []
+        nodes_by_ip = collections.OrderedDict()
+
+        for node in nodes:
+            ip_address = (instances_info[node.uuid] or {}).get('ipv4_address')
+            if ip_address:
+                nodes_by_ip[ip_address] = node
+            else:
+                unreachable_nodes.append(node)
+
+        try:
+            self._check_nodes_ssh(list(nodes_by_ip.values()),
+                                  timeout=timeout,
+                                  ip_addresses=list(nodes_by_ip))
+        except parallel.ParallelExecutionError as e:
+            unreachable_nodes.extend(nodes_by_ip[ip_address]
+                                     for ip_address in e.errors)
+
+        return unreachable_nodes
 
     @steps_checker.step
     def set_nodes_state_bad_request(self, nodes, state):
@@ -706,13 +1541,21 @@ class IronicNodeSteps(BaseSteps):
                         format(node.uuid)))
 
     @steps_checker.step
-    def attach_nodes_to_chassis(self, nodes, chassis, check=True):
+    def attach_nodes_to_chassis(self,
+                                nodes,
+                                chassis,
+                                check=True,
+                                nodes_patch=None):
         """Step to attach nodes to chassis.
 
         Args:
             nodes (list): the list of ironic nodes.
             chassis (list): the list of ironic chassis.
-            check (bool): flag whether to check step or not.
+            check (bool): flag whether to check step or not; it's ignored
+                if `nodes_patch` is passed.
+            nodes_patch (PatchAccumulator, optional): accumulated patch to
+                add the change to; it's sent and checked by caller with
+                `apply_nodes_patch` then.
 
         Raises:
             AssertionError: if particular nodes weren't applied.
@@ -723,7 +1566,11 @@ class IronicNodeSteps(BaseSteps):
             'value': chassis[0].uuid
         }]
 
-        self.update_nodes(nodes=nodes, patch=node_patch)
+        if nodes_patch is not None:
+            nodes_patch.add(nodes, node_patch)
+            return
+
+        self.update_nodes(nodes=nodes, patch=node_patch, check=False)
 
         if check:
             self.check_nodes_attached_to_chassis(nodes, chassis)
@@ -739,18 +1586,27 @@ class IronicNodeSteps(BaseSteps):
         Raises:
             AssertionError: if nodes weren't attached to chassis.
         """
-        for node in nodes:
-            node = self._get_node(node.uuid)
-            assert_that(node.chassis_uuid, equal_to(chassis[0].uuid))
+        index = self.get_chassis_nodes_index(chassis[:1])
+        attached_uuids = {node.uuid for node in index[chassis[0].uuid]}
+
+        assert_that({node.uuid for node in nodes} - attached_uuids, empty())
 
     @steps_checker.step
-    def detach_nodes_from_chassis(self, nodes, chassis, check=True):
+    def detach_nodes_from_chassis(self,
+                                  nodes,
+                                  chassis,
+                                  check=True,
+                                  nodes_patch=None):
         """Step to detach nodes from chassis.
 
         Args:
             nodes (list): the list of ironic nodes.
             chassis (list): the list of ironic chassis.
-            check (bool): flag whether to check step or not.
+            check (bool): flag whether to check step or not; it's ignored
+                if `nodes_patch` is passed.
+            nodes_patch (PatchAccumulator, optional): accumulated patch to
+                add the change to; it's sent and checked by caller with
+                `apply_nodes_patch` then.
 
         Raises:
             AssertionError: if particular nodes weren't applied.
@@ -761,7 +1617,11 @@ class IronicNodeSteps(BaseSteps):
             'value': chassis[0].uuid
         }]
 
-        self.update_nodes(nodes=nodes, patch=node_patch)
+        if nodes_patch is not None:
+            nodes_patch.add(nodes, node_patch)
+            return
+
+        self.update_nodes(nodes=nodes, patch=node_patch, check=False)
 
         if check:
             self.check_nodes_not_attached_to_chassis(nodes, chassis)
@@ -777,7 +1637,31 @@ class IronicNodeSteps(BaseSteps):
         Raises:
             AssertionError: if nodes weren't attached to chassis.
         """
-        for chassis in chassis_list:
-            for node in nodes:
-                node = self._get_node(node.uuid)
-                assert_that(node.chassis_uuid, is_not(chassis.uuid))
+        index = self.get_chassis_nodes_index(chassis_list)
+        attached_uuids = {node.uuid for chassis_nodes in index.values()
+                          for node in chassis_nodes}
+
+        assert_that({node.uuid for node in nodes} & attached_uuids, empty())
+
+    @steps_checker.step
+    def get_chassis_nodes_index(self, chassis_list):
+        """Step to get nodes attached to chassis.
+
+        Nodes of each chassis are listed with single request, requests for
+        different chassis are sent concurrently.
+
+        Args:
+            chassis_list (list): the list of ironic chassis.
+
+        Returns:
+            OrderedDict: lists of attached nodes with `uuid` and
+                `chassis_uuid` fields by chassis uuid.
+        """
+        return parallel.parallel_map(
+            lambda chassis: list(self._client.node.list(
+                chassis=chassis.uuid,
+                fields=['uuid', 'chassis_uuid'],
+                limit=0)),
+            chassis_list,
+            workers=self.workers,
+            key=lambda chassis: chassis.uuid)
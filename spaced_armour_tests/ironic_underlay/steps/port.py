@@ -19,11 +19,17 @@ Ironic port steps
 
 
 from ironicclient import exceptions
-from hamcrest import assert_that, is_not, empty, equal_to  # noqa
+from hamcrest import assert_that, is_not, empty, equal_to, is_in  # noqa
 from stepler import base
 from stepler.third_party import steps_checker
 from stepler.third_party import utils
-from stepler.third_party import waiter
+
+from spaced_armour_tests.ironic_underlay import config
+from spaced_armour_tests.ironic_underlay import registry
+from spaced_armour_tests.ironic_underlay.port_index import PortIndex
+from third_party import deadline
+from third_party import parallel
+from third_party.utils import iterate_pages
 
 __all__ = [
     'IronicPortSteps'
@@ -33,6 +39,57 @@ __all__ = [
 class IronicPortSteps(base.BaseSteps):
     """Ironic port steps."""
 
+    workers = config.IRONIC_API_WORKERS
+    registry = None
+    port_index = None
+
+    def _get_nodes_ports(self, nodes_uuids):
+        """Get ports of nodes with concurrent listing per node.
+
+        Ports of all nodes aren't listed, because inventory of shared ironic
+        may be much bigger than watched nodes.
+
+        Args:
+            nodes_uuids (iterable): uuids of nodes.
+
+        Returns:
+            dict: ironic ports with `uuid`, `address` and `node_uuid` fields
+                by port uuid.
+        """
+        nodes_uuids = set(nodes_uuids)
+        fields = ['uuid', 'address', 'node_uuid']
+
+        def _list_node_ports(node_uuid):
+            try:
+                return self._client.port.list(node=node_uuid,
+                                              fields=fields,
+                                              limit=0)
+            except exceptions.NotFound:
+                return []  # node is deleted with its ports
+
+        nodes_ports = parallel.parallel_map(_list_node_ports,
+                                            nodes_uuids,
+                                            workers=self.workers)
+
+        return {port.uuid: port for ports in nodes_ports.values()
+                for port in ports}
+
+    def _get_port_index(self, refresh=False):
+        """Get index of ports by MAC address, build it on first use.
+
+        Args:
+            refresh (bool): flag whether to index new ports.
+
+        Returns:
+            PortIndex: index of ironic ports.
+        """
+        if self.port_index is None:
+            self.port_index = PortIndex(self._client)
+        if refresh or not self.port_index.refreshed:
+            self.port_index.refresh()
+
+        return self.port_index
+
     @steps_checker.step
     def create_ports(self,
                      node,
@@ -75,6 +132,9 @@ class IronicPortSteps(base.BaseSteps):
             _port_addresses[port.uuid] = address
             ports.append(port)
 
+        if self.registry is not None:
+            self.registry.add(registry.PORT, ports)
+
         if check:
             self.check_ports_presence(ports)
             for port in ports:
@@ -83,6 +143,92 @@ class IronicPortSteps(base.BaseSteps):
 
         return ports
 
+    @steps_checker.step
+    def create_ports_bulk(self, nodes_addresses, check=True, **kwargs):
+        """Step to create ports of many nodes concurrently.
+
+        Args:
+            nodes_addresses (dict): MAC addresses of ports by ironic node
+                uuid.
+            check (bool): flag whether to check ports were created with
+                correct addresses and nodes.
+            kwargs: other attributes of created ports like in
+                `create_ports`.
+
+        Returns:
+            list: created ironic ports in order of nodes and addresses.
+
+        Raises:
+            ParallelExecutionError: if any port wasn't created; created
+                ports are registered anyway.
+            AssertionError: if check failed.
+        """
+        items = [(node_uuid, address)
+                 for node_uuid, addresses in nodes_addresses.items()
+                 for address in addresses]
+
+        try:
+            ports = parallel.parallel_map(
+                lambda item: self._client.port.create(node_uuid=item[0],
+                                                      address=item[1],
+                                                      **kwargs),
+                items,
+                workers=self.workers)
+        except parallel.ParallelExecutionError as e:
+            if self.registry is not None:
+                self.registry.add(registry.PORT, e.results.values())
+            raise
+
+        ports = list(ports.values())
+        if self.registry is not None:
+            self.registry.add(registry.PORT, ports)
+
+        if check:
+            created_uuids = {port.uuid for port in ports}
+            listed_ports = self._get_nodes_ports(nodes_addresses)
+            # ironic keeps MAC addresses in lower case
+            assert_that(
+                {(listed_port.node_uuid, listed_port.address.lower())
+                 for port_uuid, listed_port in listed_ports.items()
+                 if port_uuid in created_uuids},
+                equal_to({(node_uuid, address.lower())
+                          for node_uuid, address in items}))
+
+        return ports
+
+    @steps_checker.step
+    def delete_ports_bulk(self, ports, check=True):
+        """Step to delete many ports concurrently.
+
+        Args:
+            ports (list): list of ironic ports.
+            check (bool): flag whether to check ports were deleted.
+
+        Raises:
+            ParallelExecutionError: if any port wasn't deleted; deleted
+                ports are unregistered anyway.
+            TimeoutExpired: if check failed after timeout.
+        """
+        deleted_uuids = []
+        try:
+            parallel.parallel_map(
+                lambda port: self._client.port.delete(port.uuid),
+                ports,
+                workers=self.workers,
+                key=lambda port: port.uuid)
+            deleted_uuids = [port.uuid for port in ports]
+        except parallel.ParallelExecutionError as e:
+            deleted_uuids = list(e.results)
+            raise
+        finally:
+            if self.port_index is not None:
+                self.port_index.discard(deleted_uuids)
+            if self.registry is not None:
+                self.registry.discard(registry.PORT, deleted_uuids)
+
+        if check:
+            self.check_ports_presence(ports, must_present=False)
+
     @steps_checker.step
     def get_ports(self, ports, check=True):
         """Step get ports and check are they present.
@@ -108,6 +254,9 @@ class IronicPortSteps(base.BaseSteps):
     def get_port_by_address(self, address, check=True):
         """Step  get port by address and check is it present.
 
+        Port is resolved from index of ports without requests, the index is
+        refreshed if the address isn't indexed yet.
+
         Args:
             address (string): port MAC address
             check (bool): flag whether to check step or not
@@ -115,7 +264,11 @@ class IronicPortSteps(base.BaseSteps):
         Raises:
             TimeoutExpired: if check failed after timeout
         """
-        port = self._client.port.get_by_address(address)
+        port = self._get_port_index().get_port(address)
+        if port is None:
+            port = self._get_port_index(refresh=True).get_port(address)
+        if port is None:
+            port = self._client.port.get_by_address(address)
 
         if check:
             self.check_ports_presence([port])
@@ -126,31 +279,47 @@ class IronicPortSteps(base.BaseSteps):
     def check_ports_presence(self, ports, must_present=True, port_timeout=0):
         """Step to check ports is present.
 
+        Ports are listed by their nodes, but they are got with get request
+        per port if their count is less than `config.IRONIC_LIST_THRESHOLD`
+        or their nodes are unknown.
+
         Args:
             ports (list): list of ironic ports
             must_present (bool): flag whether ports should be present or not
-            port_timeout (int): seconds to wait a result of check
+            port_timeout (int): seconds to wait a result of check for
+                each port
 
         Raises:
             TimeoutExpired: if check failed after timeout
         """
         expected_presence = {port.uuid: must_present for port in ports}
+        nodes_uuids = {port.uuid: getattr(port, 'node_uuid', None)
+                       for port in ports}
 
-        def _check_ports_presence():
-            actual_presence = {}
+        def _get_ports_presence(ports_uuids):
+            ports_nodes = {nodes_uuids[uuid] for uuid in ports_uuids}
 
-            for port in ports:
-                try:
-                    self._client.port.get(port.uuid)
-                    actual_presence[port.uuid] = True
-                except exceptions.NotFound:
-                    actual_presence[port.uuid] = False
+            if (len(ports_uuids) < config.IRONIC_LIST_THRESHOLD or
+                    None in ports_nodes):
+                actual_presence = {}
 
-            return waiter.expect_that(actual_presence,
-                                      equal_to(expected_presence))
+                for port_uuid in ports_uuids:
+                    try:
+                        self._client.port.get(port_uuid)
+                        actual_presence[port_uuid] = True
+                    except exceptions.NotFound:
+                        actual_presence[port_uuid] = False
 
-        timeout = len(ports) * port_timeout
-        waiter.wait(_check_ports_presence, timeout_seconds=timeout)
+                return actual_presence
+
+            listed_ports = self._get_nodes_ports(ports_nodes)
+
+            return {port_uuid: port_uuid in listed_ports
+                    for port_uuid in ports_uuids}
+
+        deadline.wait_each(_get_ports_presence,
+                           expected_presence,
+                           timeout_seconds=port_timeout)
 
     @steps_checker.step
     def delete_ports(self, ports, check=True):
@@ -166,6 +335,13 @@ class IronicPortSteps(base.BaseSteps):
         for port in ports:
             self._client.port.delete(port.uuid)
 
+        if self.port_index is not None:
+            self.port_index.discard([port.uuid for port in ports])
+
+        if self.registry is not None:
+            self.registry.discard(registry.PORT,
+                                  [port.uuid for port in ports])
+
         if check:
             self.check_ports_presence(ports, must_present=False)
 
@@ -187,9 +363,29 @@ class IronicPortSteps(base.BaseSteps):
             assert_that(ports, is_not(empty()))
         return ports
 
+    @steps_checker.step
+    def get_ports_iterator(self, page_size=None, **kwargs):
+        """Step to iterate over ports page by page.
+
+        Args:
+            page_size (int, optional): count of ports got with single
+                request, `config.IRONIC_PAGE_SIZE` by default
+            **kwargs: other arguments of ports listing, like `node`
+
+        Returns:
+            generator: ironic ports
+        """
+        return iterate_pages(self._client.port.list,
+                             page_size or config.IRONIC_PAGE_SIZE,
+                             **kwargs)
+
     @steps_checker.step
     def get_ports_fixed_ip_address(self, ports, check=True):
-        """Step to get port's ip addresses.
+        """Step to get instances ip addresses of ports nodes.
+
+        Ports are resolved from index of ports, which is refreshed only if
+        any of them isn't indexed yet. Instances IP addresses are got again
+        with get request per node of ports.
 
         Args:
             ports (list): list of ironic ports
@@ -201,12 +397,20 @@ class IronicPortSteps(base.BaseSteps):
         Raises:
             AssertionError: if check failed
         """
-        ip_addresses = []
-        for port in ports:
-            ip_addresses.append(self._client.port.get_by_address(port.address))
+        port_index = self._get_port_index()
+        if any(port_index.get_port(port.address) is None for port in ports):
+            port_index.refresh()
+
+        nodes_uuids = {port_index.get_node_uuid(port.address)
+                       for port in ports}
+        nodes_uuids.discard(None)
+        port_index.refresh_nodes(nodes_uuids)
+        ip_addresses = [port_index.get_instance_ip(port.address)
+                        for port in ports]
 
         if check:
             assert_that(ip_addresses, is_not(empty()))
+            assert_that(None, is_not(is_in(ip_addresses)))
 
         return ip_addresses
 
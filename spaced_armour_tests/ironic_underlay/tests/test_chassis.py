@@ -16,6 +16,7 @@ Ironic chassis tests
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from hamcrest import assert_that, contains_inanyorder, empty
 import pytest
 
 
@@ -27,7 +28,9 @@ def test_chassis_create(create_nodes,
 
     **Setup:**
 
-    #. Create 3 ironic nodes
+    #. Enroll 3 ironic nodes with ports to the pool on first use
+    #. Reset nodes to 'available' provision state
+    #. Restore enrolled definition and ports of nodes
 
     **Steps:**
 
@@ -40,7 +43,6 @@ def test_chassis_create(create_nodes,
 
     **Teardown:**
 
-    #. Delete ironic nodes
     #. Delete ironic chassis
     """
     chassis_01 = ironic_chassis_steps.create_ironic_chassis()
@@ -53,3 +55,58 @@ def test_chassis_create(create_nodes,
                                                           chassis_01)
 
     ironic_node_steps.detach_nodes_from_chassis(create_nodes, chassis_02)
+
+
+@pytest.mark.idempotent_id('dfe1c6c0-607a-481d-9fac-572817eb8bd6')
+def test_chassis_bulk_create_delete(ironic_chassis_steps):
+    """**Scenario:** Verify that many chassis can be created and deleted.
+
+    **Steps:**
+
+    #. Create 20 ironic chassis concurrently
+    #. Check that all chassis were created
+    #. Delete created chassis concurrently
+    #. Check that all chassis were deleted
+    """
+    created, errors = ironic_chassis_steps.create_ironic_chassis_bulk(
+        count=20)
+    assert_that(errors, empty())
+
+    deleted, errors = ironic_chassis_steps.delete_ironic_chassis_bulk(
+        list(created.values()))
+    assert_that(errors, empty())
+
+
+@pytest.mark.idempotent_id('6ac417a0-58c5-44d6-ada4-c6a74f5f4fb3')
+def test_chassis_maintenance_waves(ironic_chassis_steps, ironic_node_steps):
+    """**Scenario:** Verify that chassis nodes are changed wave by wave.
+
+    **Setup:**
+
+    #. Create 3 ironic nodes with fake driver
+
+    **Steps:**
+
+    #. Create ironic chassis
+    #. Add all nodes to chassis
+    #. Set maintenance of chassis nodes by waves of 2 nodes
+    #. Check that maintenance was set for all nodes
+    #. Unset maintenance of all chassis nodes at once
+    #. Detach nodes from chassis
+
+    **Teardown:**
+
+    #. Delete ironic nodes
+    #. Delete ironic chassis
+    """
+    nodes = ironic_node_steps.create_ironic_nodes(count=3)
+    chassis = ironic_chassis_steps.create_ironic_chassis()
+    ironic_node_steps.attach_nodes_to_chassis(nodes, chassis)
+
+    latencies = ironic_chassis_steps.set_chassis_maintenance(
+        chassis[0], state=True, wave_size=2)
+    assert_that(list(latencies),
+                contains_inanyorder(*[node.uuid for node in nodes]))
+
+    ironic_chassis_steps.set_chassis_maintenance(chassis[0], state=False)
+    ironic_node_steps.detach_nodes_from_chassis(nodes, chassis)
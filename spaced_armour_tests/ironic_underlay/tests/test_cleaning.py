@@ -24,7 +24,8 @@ from third_party.utils import ssh_connection
 
 @pytest.mark.idempotent_id('de64a66b-5bb5-4c79-a8a4-cf486c007dae')
 def test_cleaning_nodes(ironic_node_steps,
-                        prepare_nodes,
+                        node_pool,
+                        booted_nodes,
                         nodes_config,
                         ironic_port_steps,
                         port_steps):
@@ -32,16 +33,14 @@ def test_cleaning_nodes(ironic_node_steps,
 
     **Setup:**
 
-    #. Create 3 ironic nodes
-    #. Update 3 ironic nodes
-    #. Create 3 ironic ports
-    #. Validate ironic nodes
+    #. Enroll 3 ironic nodes with ports to the pool on first use
+    #. Reset nodes to 'available' provision state
+    #. Restore enrolled definition and ports of nodes
+    #. Deploy instances or reuse ones deployed for previous tests
 
     **Steps:**
 
-    #. Set nodes state 'active'
-    #. Get instances IP addresses
-    #. Check instances are reachable via IP
+    #. Mark nodes dirty to deploy them again for next tests
     #. Set nodes provision state `deleted`
     #. Set nodes provision state `manage`
     #. Clean nodes
@@ -56,33 +55,33 @@ def test_cleaning_nodes(ironic_node_steps,
 
     **Teardown:**
 
-    #. Delete 3 ironic nodes
+    #. Keep nodes in the pool, they are deleted after all tests
     """
-    ironic_node_steps.boot_servers(prepare_nodes)
+    node_pool.mark_dirty(booted_nodes)
 
     ironic_node_steps.set_nodes_provision_state(
-        prepare_nodes,
+        booted_nodes,
         state='deleted',
         timeout=config.CHANGE_NODE_STATE_TIMEOUT)
 
     ironic_node_steps.set_nodes_provision_state(
-        prepare_nodes,
+        booted_nodes,
         state='manage',
         check=False,
         timeout=config.CHANGE_NODE_STATE_TIMEOUT)
 
     ironic_node_steps.clean_nodes(
-        prepare_nodes,
+        booted_nodes,
         cleansteps=config.CLEANSTEPS,
         timeout=config.CLEANING_NODES_TIMEOUT,
         check=False)
 
     ironic_node_steps.check_ironic_nodes_provision_state(
-        prepare_nodes,
+        booted_nodes,
         state='clean wait',
         node_timeout=config.CHANGE_NODE_STATE_TIMEOUT)
 
-    ironic_node_steps.set_maintenance(prepare_nodes, state=True)
+    ironic_node_steps.set_maintenance(booted_nodes, state=True)
 
     mac_addresses = ironic_port_steps.get_ports_mac_addresses(nodes_config)
 
@@ -96,14 +95,14 @@ def test_cleaning_nodes(ironic_node_steps,
                    password=config.ANSIBLE_IMAGE_PASSWORD,
                    timeout=config.SSH_TIMEOUT)
 
-    ironic_node_steps.set_maintenance(prepare_nodes, state=False, check=False)
+    ironic_node_steps.set_maintenance(booted_nodes, state=False, check=False)
 
     ironic_node_steps.check_ironic_nodes_provision_state(
-        prepare_nodes,
+        booted_nodes,
         state='clean wait',
         node_timeout=config.CHANGE_NODE_STATE_TIMEOUT)
 
     ironic_node_steps.check_ironic_nodes_provision_state(
-        prepare_nodes,
+        booted_nodes,
         state='manage',
         node_timeout=config.CHANGE_NODE_STATE_TIMEOUT)
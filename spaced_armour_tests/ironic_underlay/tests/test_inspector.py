@@ -27,10 +27,9 @@ def test_inspect_nodes(prepare_nodes, ironic_node_steps):
 
     **Setup:**
 
-    #. Create 3 ironic nodes
-    #. Update 3 ironic nodes
-    #. Create 3 ironic ports
-    #. Validate ironic nodes
+    #. Enroll 3 ironic nodes with ports to the pool on first use
+    #. Reset nodes to 'available' provision state
+    #. Restore enrolled definition and ports of nodes
 
     **Steps:**
 
@@ -42,7 +41,7 @@ def test_inspect_nodes(prepare_nodes, ironic_node_steps):
 
     **Teardown:**
 
-    #. Delete 3 ironic nodes
+    #. Keep nodes in the pool, they are deleted after all tests
     """
     ironic_node_steps.inspect_nodes(prepare_nodes)
     ironic_node_steps.set_nodes_provision_state(
@@ -59,10 +58,9 @@ def test_boot_inspect_nodes_at_the_same_time(prepare_nodes, ironic_node_steps):
 
     **Setup:**
 
-    #. Create 3 ironic nodes
-    #. Update 3 ironic nodes
-    #. Create 3 ironic ports
-    #. Validate ironic nodes
+    #. Enroll 3 ironic nodes with ports to the pool on first use
+    #. Reset nodes to 'available' provision state
+    #. Restore enrolled definition and ports of nodes
 
     **Steps:**
 
@@ -72,7 +70,7 @@ def test_boot_inspect_nodes_at_the_same_time(prepare_nodes, ironic_node_steps):
 
     **Teardown:**
 
-    #. Delete 3 ironic nodes
+    #. Keep nodes in the pool, they are deleted after all tests
     """
     inspect_node = [prepare_nodes[0]]
     boot_nodes = prepare_nodes[1:]
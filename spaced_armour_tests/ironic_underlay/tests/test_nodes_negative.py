@@ -30,10 +30,9 @@ def test_delete_nodes_in_maintenance(ironic_node_steps,
 
     **Setup:**
 
-    #. Create 3 ironic nodes
-    #. Update 3 ironic nodes
-    #. Create 3 ironic ports
-    #. Validate ironic nodes
+    #. Enroll 3 ironic nodes with ports to the pool on first use
+    #. Reset nodes to 'available' provision state
+    #. Restore enrolled definition and ports of nodes
 
     **Steps:**
     #. Set nodes to 'maintenance'
@@ -42,7 +41,7 @@ def test_delete_nodes_in_maintenance(ironic_node_steps,
 
     **Teardown:**
 
-    #. Delete 3 ironic nodes
+    #. Keep nodes in the pool, they are deleted after all tests
     """
     ironic_node_steps.set_maintenance(
         nodes=prepare_nodes,
@@ -65,10 +64,9 @@ def test_boot_instances_nodes_in_maintenance(ironic_node_steps, prepare_nodes):
 
     **Setup:**
 
-    #. Create 3 ironic nodes
-    #. Update 3 ironic nodes
-    #. Create 3 ironic ports
-    #. Validate ironic nodes
+    #. Enroll 3 ironic nodes with ports to the pool on first use
+    #. Reset nodes to 'available' provision state
+    #. Restore enrolled definition and ports of nodes
 
     **Steps:**
 
@@ -77,7 +75,7 @@ def test_boot_instances_nodes_in_maintenance(ironic_node_steps, prepare_nodes):
 
     **Teardown:**
 
-    #. Delete 3 ironic nodes
+    #. Keep nodes in the pool, they are deleted after all tests
     """
     ironic_node_steps.set_maintenance(
         nodes=prepare_nodes,
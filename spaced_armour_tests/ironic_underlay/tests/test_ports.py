@@ -0,0 +1,59 @@
+"""
+-----------------
+Ironic port tests
+-----------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import collections
+
+from hamcrest import assert_that, equal_to
+import pytest
+from stepler.third_party import utils
+
+
+@pytest.mark.idempotent_id('3598f854-a50f-4ce8-bc8d-781ef79519b7')
+def test_create_delete_ports_bulk(ironic_node_steps, ironic_port_steps):
+    """**Scenario:** Verify that ports of many nodes are created at once.
+
+    **Setup:**
+
+    #. Create 3 ironic nodes with fake driver
+
+    **Steps:**
+
+    #. Create 2 ports of each node concurrently with upper case MAC
+       addresses
+    #. Get each port by upper case MAC address
+    #. Check port belongs to its node
+    #. Delete all ports concurrently
+
+    **Teardown:**
+
+    #. Delete ironic nodes
+    """
+    nodes = ironic_node_steps.create_ironic_nodes(count=3)
+    nodes_addresses = collections.OrderedDict(
+        (node.uuid, [address.upper()
+                     for address in utils.generate_mac_addresses(count=2)])
+        for node in nodes)
+
+    ports = ironic_port_steps.create_ports_bulk(nodes_addresses)
+
+    for node_uuid, addresses in nodes_addresses.items():
+        for address in addresses:
+            port = ironic_port_steps.get_port_by_address(address)
+            assert_that(port.node_uuid, equal_to(node_uuid))
+
+    ironic_port_steps.delete_ports_bulk(ports)
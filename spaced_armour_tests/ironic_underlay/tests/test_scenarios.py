@@ -16,12 +16,16 @@ Ironic scenarios tests
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import logging
+
 import pytest
 
 from spaced_armour_tests.ironic_underlay import config
 
 from third_party import utils
 
+LOGGER = logging.getLogger(__name__)
+
 
 @pytest.mark.idempotent_id('6492f39a-cceb-4bf9-aaff-27b123366ccc')
 def test_enroll_nodes(ironic_node_steps, prepare_nodes):
@@ -29,10 +33,9 @@ def test_enroll_nodes(ironic_node_steps, prepare_nodes):
 
     **Setup:**
 
-    #. Create 3 ironic nodes
-    #. Update 3 ironic nodes
-    #. Create 3 ironic ports
-    #. Validate ironic nodes
+    #. Enroll 3 ironic nodes with ports to the pool on first use
+    #. Reset nodes to 'available' provision state
+    #. Restore enrolled definition and ports of nodes
 
     **Steps:**
 
@@ -42,7 +45,7 @@ def test_enroll_nodes(ironic_node_steps, prepare_nodes):
 
     **Teardown:**
 
-    #. Delete 3 ironic nodes
+    #. Keep nodes in the pool, they are deleted after all tests
     """
     ironic_node_steps.boot_servers(prepare_nodes)
 
@@ -50,22 +53,19 @@ def test_enroll_nodes(ironic_node_steps, prepare_nodes):
 @pytest.mark.idempotent_id('8ba5c32a-8b1d-4006-86c1-3827d33b9229')
 @pytest.mark.parametrize("node_maintenance", [True, False])
 def test_change_nodes_power_state_maintenance(ironic_node_steps,
-                                              prepare_nodes,
+                                              booted_nodes,
                                               node_maintenance):
     """**Scenario:** Test changing ironic nodes power states and maintenance.
 
     **Setup:**
 
-    #. Create 3 ironic nodes
-    #. Update 3 ironic nodes
-    #. Create 3 ironic ports
-    #. Validate ironic nodes
+    #. Enroll 3 ironic nodes with ports to the pool on first use
+    #. Reset nodes to 'available' provision state
+    #. Restore enrolled definition and ports of nodes
+    #. Deploy instances or reuse ones deployed for previous tests
 
     **Steps:**
 
-    #. Set nodes state 'active'
-    #. Check instances are reachable via IP
-    #. Get instances IP addresses
     #. Set nodes to 'maintenance'
     #. Set nodes power state to 'off'
     #. Set nodes power state to 'on'
@@ -73,27 +73,25 @@ def test_change_nodes_power_state_maintenance(ironic_node_steps,
 
     **Teardown:**
 
-    #. Delete 3 ironic nodes
+    #. Keep nodes in the pool, they are deleted after all tests
     """
 
-    ironic_node_steps.boot_servers(prepare_nodes)
-
     ironic_node_steps.set_maintenance(
-        nodes=prepare_nodes,
+        nodes=booted_nodes,
         state=node_maintenance,
         timeout=config.CHANGE_NODE_STATE_TIMEOUT)
 
     ironic_node_steps.set_ironic_nodes_power_state(
-        nodes=prepare_nodes,
+        nodes=booted_nodes,
         state='off',
         timeout=config.CHANGE_NODE_STATE_TIMEOUT)
 
     ironic_node_steps.set_ironic_nodes_power_state(
-        nodes=prepare_nodes,
+        nodes=booted_nodes,
         state='on',
         timeout=config.CHANGE_NODE_STATE_TIMEOUT)
 
-    ironic_node_steps.check_ssh_connection(nodes=prepare_nodes)
+    ironic_node_steps.check_ssh_connection(nodes=booted_nodes)
 
 
 @pytest.mark.idempotent_id('078a29c0-f420-4414-bfed-43987c94526f')
@@ -105,10 +103,9 @@ def test_change_nodes_provisioning_state_maintenance(ironic_node_steps,
 
     **Setup:**
 
-    #. Create 3 ironic nodes
-    #. Update 3 ironic nodes
-    #. Create 3 ironic ports
-    #. Validate ironic nodes
+    #. Enroll 3 ironic nodes with ports to the pool on first use
+    #. Reset nodes to 'available' provision state
+    #. Restore enrolled definition and ports of nodes
 
     **Steps:**
     #. Set nodes to 'maintenance'
@@ -118,7 +115,7 @@ def test_change_nodes_provisioning_state_maintenance(ironic_node_steps,
 
     **Teardown:**
 
-    #. Delete 3 ironic nodes
+    #. Keep nodes in the pool, they are deleted after all tests
     """
     ironic_node_steps.set_maintenance(
         nodes=prepare_nodes,
@@ -143,25 +140,18 @@ def test_change_nodes_provisioning_state_maintenance(ironic_node_steps,
 
 @pytest.mark.idempotent_id('b3c476ba-d2f6-404b-8961-d8347818c930')
 def test_rebuild_nodes(ironic_node_steps,
-                       prepare_nodes):
+                       booted_nodes):
     """**Scenario:** Rebuild ironic nodes.
 
     **Setup:**
 
-    #. Create 3 ironic nodes
-    #. Update 3 ironic nodes
-    #. Create 3 ironic ports
-    #. Validate ironic nodes
+    #. Enroll 3 ironic nodes with ports to the pool on first use
+    #. Reset nodes to 'available' provision state
+    #. Restore enrolled definition and ports of nodes
+    #. Deploy instances or reuse ones deployed for previous tests
 
     **Steps:**
 
-    #. Set node state 'active'
-    #. Get instance IP address
-    #. Check if instance is reachable via IP
-    #. Set ironic nodes state 'active'
-    #. Check ironic nodes provision state
-    #. Get instances IP addresses
-    #. Check instances are reachable via IP
     #. Set node state 'rebuild'
     #. Check ironic nodes state is `active`
     #. Get instance IP addresses
@@ -169,23 +159,59 @@ def test_rebuild_nodes(ironic_node_steps,
 
     **Teardown:**
 
-    #. Delete ironic node
+    #. Keep nodes in the pool, they are deleted after all tests
     """
-    ironic_node_steps.boot_servers(prepare_nodes)
-
     ironic_node_steps.set_nodes_provision_state(
-        prepare_nodes,
+        booted_nodes,
         state='rebuild',
         check=False)
 
     ironic_node_steps.check_ironic_nodes_provision_state(
-        prepare_nodes,
+        booted_nodes,
         state='active',
         node_timeout=config.CHANGE_NODE_STATE_TIMEOUT)
 
-    ip_address = ironic_node_steps.get_instance_ipv4_addresses(prepare_nodes)
+    ip_address = ironic_node_steps.get_instance_ipv4_addresses(booted_nodes)
 
     utils.ssh_connection(ipv4_addresses=ip_address,
                          username=config.IMAGE_USERNAME,
                          password=config.IMAGE_PASSWORD,
                          timeout=config.SSH_TIMEOUT)
+
+
+@pytest.mark.idempotent_id('4f0e2b7a-1c53-4d8e-9a61-7b2d9c8e5f30')
+@pytest.mark.skipif(not config.SSH_BENCHMARK,
+                    reason="SSH benchmark is enabled with SSH_BENCHMARK")
+def test_ssh_handshakes_rate(ironic_node_steps, booted_nodes):
+    """**Scenario:** Measure SSH handshakes rate for worker processes.
+
+    It's a benchmark, it's skipped unless `SSH_BENCHMARK` is set.
+
+    **Setup:**
+
+    #. Enroll 3 ironic nodes with ports to the pool on first use
+    #. Reset nodes to 'available' provision state
+    #. Restore enrolled definition and ports of nodes
+    #. Deploy instances or reuse ones deployed for previous tests
+
+    **Steps:**
+
+    #. Check SSH connection with worker processes
+    #. Measure SSH handshakes per second for 1, 2, 4 and 8 processes
+
+    **Teardown:**
+
+    #. Keep nodes in the pool, they are deleted after all tests
+    """
+    ironic_node_steps.check_ssh_connection(nodes=booted_nodes, processes=2)
+
+    ip_addresses = ironic_node_steps.get_instance_ipv4_addresses(booted_nodes)
+
+    rates = utils.benchmark_ssh_handshakes(
+        ipv4_addresses=ip_addresses,
+        username=config.IMAGE_USERNAME,
+        password=config.IMAGE_PASSWORD)
+
+    for processes, rate in rates.items():
+        LOGGER.info("%d process(es): %.2f SSH handshakes per second",
+                    processes, rate)
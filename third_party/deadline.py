@@ -0,0 +1,136 @@
+"""
+-----------------------
+Per item deadline waits
+-----------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import time
+
+from waiting import exceptions
+
+__all__ = [
+    'DeadlineExpired',
+    'wait_each',
+]
+
+# (min, max, multiplier) like `sleep_seconds` of `waiting.wait`
+SLEEP_SECONDS = (1, 15, 1.5)
+JITTER = 0.2
+
+_NOT_OBSERVED = object()
+
+
+class DeadlineExpired(exceptions.TimeoutExpired):
+    """Error raised if some items didn't reach expected value in time.
+
+    Attributes:
+        missed (dict): seconds each missed item overran its deadline by.
+        expected (dict): expected values of missed items.
+        actual (dict): last observed values of missed items.
+    """
+
+    def __init__(self, timeout_seconds, missed, expected, actual):
+        self.missed = missed
+        self.expected = expected
+        self.actual = actual
+
+        what = ', '.join(
+            "{0} to be {1!r} (last seen {2!r}, missed by {3:.1f}s)".format(
+                key, expected[key], actual[key], missed[key])
+            for key in sorted(missed))
+
+        super(DeadlineExpired, self).__init__(timeout_seconds, what)
+
+
+def wait_each(poll,
+              expected,
+              timeout_seconds,
+              sleep_seconds=SLEEP_SECONDS,
+              jitter=JITTER,
+              on_reached=None):
+    """Wait until each item reaches expected value before its deadline.
+
+    Items which reached expected value or missed the deadline aren't
+    watched anymore. Sleep between polls grows exponentially while
+    nothing changes and drops back to minimum on any observed change.
+
+    Args:
+        poll (function): function taking list of pending item keys and
+            returning dict of their actual values; missing key means None.
+        expected (dict): expected values by item key.
+        timeout_seconds (int|dict): seconds to wait for each item, can be
+            specified per item key.
+        sleep_seconds (tuple): min, max and multiplier of sleep between
+            polls.
+        jitter (float): max relative random deviation of sleep.
+        on_reached (function, optional): function called with item key as
+            soon as item reaches expected value.
+
+    Returns:
+        dict: seconds spent before each item reached expected value.
+
+    Raises:
+        DeadlineExpired: if any item missed its deadline.
+    """
+    start = time.time()
+    if not isinstance(timeout_seconds, dict):
+        timeout_seconds = dict.fromkeys(expected, timeout_seconds)
+    deadlines = {key: start + timeout_seconds[key] for key in expected}
+
+    min_sleep, max_sleep, multiplier = sleep_seconds
+    sleep = min_sleep
+
+    pending = set(expected)
+    actual = dict.fromkeys(expected, _NOT_OBSERVED)
+    reached = {}
+    missed = {}
+
+    while pending:
+        observed = poll(list(pending))
+        now = time.time()
+        changed = False
+
+        for key in list(pending):
+            value = observed.get(key)
+            changed = changed or value != actual[key]
+            actual[key] = value
+
+            if value == expected[key]:
+                reached[key] = now - start
+                pending.remove(key)
+                if on_reached:
+                    on_reached(key)
+            elif now >= deadlines[key]:
+                missed[key] = now - deadlines[key]
+                pending.remove(key)
+
+        if not pending:
+            break
+
+        sleep = min_sleep if changed else min(sleep * multiplier, max_sleep)
+        next_deadline = min(deadlines[key] for key in pending) - now
+        time.sleep(max(0, min(
+            sleep * random.uniform(1 - jitter, 1 + jitter), next_deadline)))
+
+    if missed:
+        raise DeadlineExpired(
+            max(timeout_seconds[key] for key in missed),
+            missed,
+            {key: expected[key] for key in missed},
+            {key: actual[key] for key in missed})
+
+    return reached
@@ -0,0 +1,119 @@
+"""
+------------------
+Parallel execution
+------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+
+from concurrent import futures
+
+__all__ = [
+    'ParallelExecutionError',
+    'collect_results',
+    'parallel_map',
+]
+
+
+class ParallelExecutionError(Exception):
+    """Aggregated error of the items failed during parallel execution.
+
+    Attributes:
+        errors (OrderedDict): exceptions raised for failed items by key.
+        results (OrderedDict): results of succeeded items by key.
+    """
+
+    def __init__(self, errors, results=None):
+        self.errors = errors
+        self.results = results or collections.OrderedDict()
+
+        report = ["{0} of {1} item(s) failed:".format(
+            len(self.errors), len(self.errors) + len(self.results))]
+        for key, error in self.errors.items():
+            report.append("  {0}: {1!r}".format(key, error))
+
+        super(ParallelExecutionError, self).__init__('\n'.join(report))
+
+
+def parallel_map(func, items, workers=1, key=None):
+    """Call function for each item using bounded thread pool.
+
+    All items are processed even if some of them fail, so caller gets
+    the full picture in one aggregated error instead of the first one.
+
+    Args:
+        func (function): function to call with single item.
+        items (iterable): items to process.
+        workers (int): max count of concurrent calls; items are processed
+            one by one in caller thread if it's less than 2.
+        key (function, optional): function to get item key for results
+            and errors; item itself is used by default.
+
+    Returns:
+        OrderedDict: results of calls by item key in order of items.
+
+    Raises:
+        ParallelExecutionError: if any call raised an exception.
+    """
+    key = key or (lambda item: item)
+    items = list(items)
+
+    if workers < 2 or len(items) < 2:
+        results = collections.OrderedDict()
+        errors = collections.OrderedDict()
+
+        for item in items:
+            try:
+                results[key(item)] = func(item)
+            except Exception as e:
+                errors[key(item)] = e
+
+        if errors:
+            raise ParallelExecutionError(errors, results)
+
+        return results
+
+    with futures.ThreadPoolExecutor(
+            max_workers=min(workers, len(items))) as executor:
+        return collect_results(
+            [(key(item), executor.submit(func, item)) for item in items])
+
+
+def collect_results(submitted):
+    """Wait for submitted futures and collect their results.
+
+    Args:
+        submitted (iterable): pairs of item key and future.
+
+    Returns:
+        OrderedDict: results of futures by item key in submit order.
+
+    Raises:
+        ParallelExecutionError: if any future raised an exception.
+    """
+    results = collections.OrderedDict()
+    errors = collections.OrderedDict()
+
+    for key, future in submitted:
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            errors[key] = e
+
+    if errors:
+        raise ParallelExecutionError(errors, results)
+
+    return results
@@ -0,0 +1,101 @@
+"""
+----------------------
+JSON patch accumulator
+----------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import threading
+
+__all__ = [
+    'MISSING',
+    'PatchAccumulator',
+    'get_path_value',
+]
+
+MISSING = object()
+
+
+class PatchAccumulator(object):
+    """JSON patch operations accumulated per resource.
+
+    Operations of several logical changes are collected by resource uuid
+    to send them with one PATCH request per resource. If several
+    operations touch the same path, only the last one is kept, except
+    appends to list with '/-' path, which are all kept in order. The
+    accumulator is thread safe.
+    """
+
+    def __init__(self):
+        self._operations = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._operations)
+
+    def add(self, resources, patch):
+        """Add JSON patch operations for resources.
+
+        Args:
+            resources (list): resources with `uuid` attribute.
+            patch (list): JSON patch operations.
+        """
+        with self._lock:
+            for resource in resources:
+                operations = self._operations.setdefault(
+                    resource.uuid, collections.OrderedDict())
+                for operation in patch:
+                    if operation['path'].endswith('/-'):
+                        # each append is kept under its own key
+                        key = object()
+                    else:
+                        key = operation['path']
+                        operations.pop(key, None)
+                    operations[key] = dict(operation)
+
+    def pop(self):
+        """Take accumulated operations and clear the accumulator.
+
+        Returns:
+            OrderedDict: lists of JSON patch operations by resource uuid.
+        """
+        with self._lock:
+            operations, self._operations = (self._operations,
+                                            collections.OrderedDict())
+
+        return collections.OrderedDict(
+            (uuid, list(patch.values())) for uuid, patch in operations.items())
+
+
+def get_path_value(document, path):
+    """Get value of JSON patch path in document.
+
+    Args:
+        document (dict): document, like resource's `to_dict()`.
+        path (str): JSON pointer, like '/instance_info/image_source'.
+
+    Returns:
+        object: value of path or `MISSING` if it's absent.
+    """
+    value = document
+    for token in path.split('/')[1:]:
+        token = token.replace('~1', '/').replace('~0', '~')
+        if not isinstance(value, dict) or token not in value:
+            return MISSING
+        value = value[token]
+
+    return value
@@ -0,0 +1,162 @@
+"""
+-------------------
+SSH connection pool
+-------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import threading
+
+from hamcrest import equal_to
+
+from stepler.third_party import ssh
+from stepler.third_party import waiter
+
+__all__ = [
+    'SshConnectionPool',
+]
+
+
+class SshConnectionPool(object):
+    """Pool of established SSH connections keyed by (host, username).
+
+    Connections can be assigned to owners, like ironic nodes, to close
+    them when owner is changed in a way which breaks them, e.g. rebooted.
+    The pool is thread safe.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._owners = collections.defaultdict(set)
+        self._lock = threading.Lock()
+
+    def connect(self, host, username, password, timeout=0):
+        """Get live SSH connection to host, establish it if needed.
+
+        Args:
+            host (str): ipv4 address or hostname of remote host
+            username (str): username to login
+            password (str): password to login
+            timeout (int): seconds to wait for successful login
+
+        Returns:
+            ssh.SshClient: established SSH connection
+
+        Raises:
+            TimeoutExpired: if connection wasn't established after timeout
+        """
+        if self.is_connected(host, username):
+            with self._lock:
+                client = self._clients.get((host, username))
+            if client is not None:
+                return client
+
+        clients = []
+
+        def _connect():
+            client = ssh.SshClient(host=host,
+                                   username=username,
+                                   password=password,
+                                   timeout=timeout)
+            try:
+                client.connect()
+            except Exception:
+                _close(client)
+                return waiter.expect_that(
+                    False, equal_to(True),
+                    "SSH connection to {} isn't established".format(host))
+
+            clients.append(client)
+            return True
+
+        waiter.wait(_connect, timeout_seconds=timeout)
+
+        with self._lock:
+            self._clients[host, username] = clients[0]
+
+        return clients[0]
+
+    def is_connected(self, host, username):
+        """Check whether pool has live SSH connection to host.
+
+        Dead connection is closed and removed from the pool.
+
+        Args:
+            host (str): ipv4 address or hostname of remote host
+            username (str): username to login
+
+        Returns:
+            bool: True if connection is alive
+        """
+        with self._lock:
+            client = self._clients.get((host, username))
+
+        if client is None:
+            return False
+
+        try:
+            client.execute('true')
+            return True
+        except Exception:
+            self._discard([(host, username)])
+            return False
+
+    def assign(self, owner, host):
+        """Assign connections to host to owner.
+
+        Args:
+            owner (str): owner identifier, e.g. ironic node uuid
+            host (str): ipv4 address or hostname of remote host
+        """
+        with self._lock:
+            self._owners[owner].add(host)
+
+    def evict(self, owners):
+        """Close connections assigned to owners.
+
+        Args:
+            owners (list): owners identifiers
+        """
+        with self._lock:
+            hosts = set()
+            for owner in owners:
+                hosts.update(self._owners.pop(owner, ()))
+            keys = [key for key in self._clients if key[0] in hosts]
+
+        self._discard(keys)
+
+    def close(self):
+        """Close all connections of the pool."""
+        with self._lock:
+            keys = list(self._clients)
+            self._owners.clear()
+
+        self._discard(keys)
+
+    def _discard(self, keys):
+        with self._lock:
+            clients = [self._clients.pop(key) for key in keys
+                       if key in self._clients]
+
+        for client in clients:
+            _close(client)
+
+
+def _close(client):
+    try:
+        client.close()
+    except Exception:
+        pass
@@ -11,14 +11,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import errno
 import json
+import socket
+import time
 import yaml
 
+try:
+    import selectors
+except ImportError:  # python 2.7
+    import selectors34 as selectors
+
+from concurrent import futures
 from hamcrest import assert_that, equal_to  # noqa
+from waiting import exceptions
 
 from stepler.third_party import ssh
 from stepler.third_party import waiter
 
+from third_party import parallel
+
+SSH_PORT = 22
+SSH_BANNER_PREFIX = b'SSH-'
+SSH_BANNER_RETRY_SECONDS = 1
+SSH_WORKERS = 10
+
 
 def load_from_file(filename):
     """Deserialize JSON or YAML from file.
@@ -50,37 +68,352 @@ def load_from_file(filename):
             '%(err)s' % {'err': e, 'file': filename})
 
 
+def iterate_pages(list_resources, page_size, **kwargs):
+    """Iterate over API collection page by page with `limit` and `marker`.
+
+    Only one page of resources is kept in memory at once.
+
+    Args:
+        list_resources (function): function listing resources, it must
+            accept `limit` and `marker` arguments
+        page_size (int): count of resources got with single request
+        **kwargs: other arguments of listing function
+
+    Yields:
+        object: resources of collection
+    """
+    marker = None
+
+    while True:
+        page = list_resources(limit=page_size, marker=marker, **kwargs)
+
+        for resource in page:
+            yield resource
+
+        if len(page) < page_size:
+            return
+
+        marker = page[-1].uuid
+
+
 def ssh_connection(ipv4_addresses,
                    username,
                    password,
                    timeout=0,
-                   check=True):
-    """Connect to the remote host through SSH.
+                   check=True,
+                   pool=None,
+                   processes=0,
+                   workers=SSH_WORKERS):
+    """Connect to the remote hosts through SSH.
+
+    All hosts are checked concurrently within the same deadline, so
+    the whole check takes no longer than `timeout` for any count of hosts.
+    If timeout is specified, SSH login to host is attempted only after its
+    SSH port answers with SSH banner.
+
+    If pool is specified, live pooled connections are reused and new
+    connections are kept in the pool instead of being closed after check.
+
+    If processes count is specified, SSH handshakes are made in pool of
+    worker processes instead of threads of the caller process, so they
+    aren't serialized by GIL; it can't be used with SSH connections pool.
 
     Args:
         ipv4_addresses (list): list of ipv4_addresses or hostnames
             of remote hosts
         username (str): username to login
         password (str): password to login
+        timeout (int): seconds to wait for successful login to all hosts
+        check (bool): flag whether to check connection or not
+        pool (SshConnectionPool, optional): pool of SSH connections
+        processes (int): count of worker processes for SSH handshakes
+        workers (int): max count of threads for concurrent SSH logins
 
     Returns:
-        tuple of objects: (ssh_stdin, ssh_stdout, ssh_stderr)
+        OrderedDict: seconds to first successful login by host address,
+            it's empty if check is disabled
 
     Raises:
-        RuntimeError: if `server_ssh` is not closed
-        TimeoutExpired: if check failed after timeout
+        ParallelExecutionError: if check failed for any host, with
+            TimeoutExpired for hosts which aren't reachable after timeout
+        ValueError: if both pool and processes are specified
     """
-    hosts = []
-    for ipv4_address in ipv4_addresses:
+    hosts = list(collections.OrderedDict.fromkeys(ipv4_addresses))
+
+    if not check or not hosts:
+        return collections.OrderedDict()
+
+    if processes:
+        if pool is not None:
+            raise ValueError("SSH connections pool can't be shared "
+                             "with worker processes")
+
+        outcomes = _login_in_processes(hosts, username, password,
+                                       timeout=timeout, processes=processes)
+        results = collections.OrderedDict()
+        errors = collections.OrderedDict()
+
+        for ipv4_address, (seconds, error) in zip(hosts, outcomes):
+            if error is None:
+                results[ipv4_address] = seconds
+            else:
+                errors[ipv4_address] = RuntimeError(error)
+
+        if errors:
+            raise parallel.ParallelExecutionError(errors, results)
+
+        return results
+
+    start = time.time()
+
+    def _check_host(ipv4_address):
+        remaining_timeout = max(0, start + timeout - time.time())
+
+        if pool is not None:
+            pool.connect(ipv4_address, username, password,
+                         timeout=remaining_timeout)
+        else:
+            host_ssh = ssh.SshClient(host=ipv4_address,
+                                     username=username,
+                                     password=password,
+                                     timeout=timeout)
+            check_ssh_connection_establishment(host_ssh,
+                                               timeout=remaining_timeout)
+        return time.time() - start
+
+    workers = max(1, min(workers, len(hosts)))
+
+    if not timeout:
+        return parallel.parallel_map(_check_host, hosts, workers=workers)
+
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        checks = collections.OrderedDict()
+
+        def _start_check(ipv4_address):
+            checks[ipv4_address] = executor.submit(_check_host, ipv4_address)
+
+        # live pooled connections are probed once, without new login
+        for ipv4_address in hosts:
+            if pool is not None and pool.is_connected(ipv4_address, username):
+                checks[ipv4_address] = futures.Future()
+                checks[ipv4_address].set_result(time.time() - start)
+
+        wait_ssh_banners(
+            [ipv4_address for ipv4_address in hosts
+             if ipv4_address not in checks],
+            timeout=timeout,
+            on_ready=_start_check)
+
+        for ipv4_address in hosts:
+            if ipv4_address not in checks:
+                checks[ipv4_address] = futures.Future()
+                checks[ipv4_address].set_exception(exceptions.TimeoutExpired(
+                    timeout, "SSH banner of {}".format(ipv4_address)))
+
+        return parallel.collect_results(
+            (ipv4_address, checks[ipv4_address]) for ipv4_address in hosts)
+
+
+def _login_in_process(ipv4_address, username, password, start, timeout):
+    """Check SSH login to host in worker process.
+
+    Returns:
+        tuple: seconds from start to successful login and error message;
+            seconds are None if login failed, error is None otherwise
+    """
+    try:
+        remaining_timeout = max(0, start + timeout - time.time())
+        if remaining_timeout and not wait_ssh_banners(
+                [ipv4_address], timeout=remaining_timeout):
+            raise exceptions.TimeoutExpired(
+                timeout, "SSH banner of {}".format(ipv4_address))
+
         host_ssh = ssh.SshClient(host=ipv4_address,
                                  username=username,
                                  password=password,
                                  timeout=timeout)
-        hosts.append(host_ssh)
+        check_ssh_connection_establishment(
+            host_ssh, timeout=max(0, start + timeout - time.time()))
+    except Exception as e:
+        return None, repr(e)
+
+    return time.time() - start, None
+
+
+def _login_in_processes(ipv4_addresses,
+                        username,
+                        password,
+                        timeout=0,
+                        processes=1):
+    """Check SSH login to hosts in pool of worker processes.
+
+    Only compact (seconds, error) tuples are sent back from workers.
+    Addresses may repeat to login to the same host several times.
+
+    Returns:
+        list: (seconds, error) tuples in order of addresses
+    """
+    start = time.time()
+    count = len(ipv4_addresses)
+
+    with futures.ProcessPoolExecutor(
+            max_workers=max(1, min(processes, count))) as executor:
+        return list(executor.map(_login_in_process,
+                                 ipv4_addresses,
+                                 [username] * count,
+                                 [password] * count,
+                                 [start] * count,
+                                 [timeout] * count))
+
+
+def login_in_process(executor, ipv4_address, username, password, timeout=0):
+    """Check SSH login to host in worker process of shared executor.
+
+    It lets hosts which become ready at different times share one pool of
+    worker processes, like `_login_in_processes` does for ready hosts.
+
+    Args:
+        executor (ProcessPoolExecutor): pool of worker processes
+        ipv4_address (str): ipv4 address or hostname of remote host
+        username (str): username to login
+        password (str): password to login
+        timeout (int): seconds to wait for successful login
+
+    Returns:
+        float: seconds to successful login
+
+    Raises:
+        RuntimeError: if login failed
+    """
+    seconds, error = executor.submit(_login_in_process, ipv4_address,
+                                     username, password, time.time(),
+                                     timeout).result()
+    if error is not None:
+        raise RuntimeError(error)
+
+    return seconds
+
+
+def benchmark_ssh_handshakes(ipv4_addresses,
+                             username,
+                             password,
+                             processes=(1, 2, 4, 8),
+                             logins_per_host=4):
+    """Measure rate of SSH handshakes for different counts of processes.
+
+    Args:
+        ipv4_addresses (list): ipv4 addresses of reachable hosts
+        username (str): username to login
+        password (str): password to login
+        processes (tuple): counts of worker processes to measure
+        logins_per_host (int): count of logins to each host per measure
+
+    Returns:
+        OrderedDict: handshakes per second by count of worker processes
+
+    Raises:
+        ParallelExecutionError: if any login failed
+    """
+    logins = list(ipv4_addresses) * logins_per_host
+    rates = collections.OrderedDict()
+
+    for count in processes:
+        start = time.time()
+        outcomes = _login_in_processes(logins, username, password,
+                                       processes=count)
+        rates[count] = len(logins) / (time.time() - start)
+
+        errors = collections.OrderedDict(
+            (ipv4_address, RuntimeError(error))
+            for ipv4_address, (_, error) in zip(logins, outcomes) if error)
+        if errors:
+            raise parallel.ParallelExecutionError(errors)
+
+    return rates
+
+
+def wait_ssh_banners(addresses,
+                     port=SSH_PORT,
+                     timeout=0,
+                     retry_seconds=SSH_BANNER_RETRY_SECONDS,
+                     on_ready=None):
+    """Wait until hosts answer with SSH banner on SSH port.
+
+    It's a cheap check of booting hosts before SSH login. Non-blocking
+    connections to all hosts are multiplexed in the caller thread; refused
+    or closed connections are retried after `retry_seconds`.
+
+    Args:
+        addresses (list): ipv4 addresses of hosts
+        port (int): SSH port
+        timeout (int): seconds to wait for banners of all hosts
+        retry_seconds (int): seconds to wait before reconnection to host
+        on_ready (function, optional): function called with host address
+            as soon as host answers with SSH banner
+
+    Returns:
+        OrderedDict: seconds to SSH banner by address of ready hosts
+    """
+    start = time.time()
+    deadline = start + timeout
+    reconnect_at = dict.fromkeys(addresses, start)
+    ready = collections.OrderedDict()
+    selector = selectors.DefaultSelector()
+
+    def _close(sock, address):
+        selector.unregister(sock)
+        sock.close()
+        reconnect_at[address] = time.time() + retry_seconds
+
+    try:
+        while reconnect_at or selector.get_map():
+            now = time.time()
+            if now >= deadline:
+                break
+
+            for address, connect_at in list(reconnect_at.items()):
+                if connect_at > now:
+                    continue
+
+                del reconnect_at[address]
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                selector.register(sock, selectors.EVENT_WRITE, address)
+
+                if sock.connect_ex((address, port)) not in (
+                        0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                    _close(sock, address)
+
+            next_reconnect = min([deadline] + list(reconnect_at.values()))
+            events = selector.select(max(0, next_reconnect - time.time()))
+
+            for key, mask in events:
+                sock, address = key.fileobj, key.data
+
+                if mask & selectors.EVENT_WRITE:
+                    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+                        _close(sock, address)
+                    else:
+                        selector.modify(sock, selectors.EVENT_READ, address)
+                    continue
+
+                try:
+                    banner = sock.recv(256)
+                except socket.error:
+                    banner = b''
+
+                _close(sock, address)
+                if banner.startswith(SSH_BANNER_PREFIX):
+                    del reconnect_at[address]
+                    ready[address] = time.time() - start
+                    if on_ready:
+                        on_ready(address)
+    finally:
+        for key in list(selector.get_map().values()):
+            key.fileobj.close()
+        selector.close()
 
-    if check:
-        for host in hosts:
-            check_ssh_connection_establishment(host, timeout=timeout)
+    return ready
 
 
 def check_ssh_connection_establishment(server_ssh,